@@ -0,0 +1,61 @@
+"""
+Building a large response: pydantic message models (validated one by one)
+versus ResponseBuilder records (checked once in build()), both through
+set_response + get_response_json.
+
+    python -m benchmarks.bench_builders --cards 200 --number 200
+"""
+import argparse
+import timeit
+
+from src.captivate_ai_api import (
+    ButtonMessageModel, Captivate, CardMessageModel, ResponseBuilder, TextMessageModel,
+)
+from src.captivate_ai_api.Captivate import CardCollectionModel
+from benchmarks.payloads import make_payload
+
+OPTIONS = [{"label": "Yes", "value": "yes"}, {"label": "No", "value": "no"}]
+
+
+def make_rows(count: int):
+    return [(f"Offer {i}", f"{i}% off everything", f"https://e.x/img/{i}.png", f"https://e.x/offers/{i}") for i in range(count)]
+
+
+def with_models(instance: Captivate, rows, texts: int) -> bytes:
+    messages = [TextMessageModel(text=f"Message {i}") for i in range(texts)]
+    messages.append(CardCollectionModel(cards=[
+        CardMessageModel(text=text, description=description, image_url=image_url, link=link)
+        for text, description, image_url, link in rows
+    ]))
+    messages.append(ButtonMessageModel(buttons={"title": "Anything else?", "options": OPTIONS}))
+    instance.set_response(messages)
+    return instance.get_response_json()
+
+
+def with_builder(instance: Captivate, rows, texts: int) -> bytes:
+    builder = ResponseBuilder()
+    for i in range(texts):
+        builder.text(f"Message {i}")
+    builder.cards(rows)
+    builder.buttons("Anything else?", OPTIONS)
+    instance.set_response(builder)
+    return instance.get_response_json()
+
+
+def main(cards: int, texts: int, number: int) -> None:
+    instance = Captivate.create(make_payload())
+    rows = make_rows(cards)
+    assert with_models(instance, rows, texts) == with_builder(instance, rows, texts)
+    models = timeit.timeit(lambda: with_models(instance, rows, texts), number=number) / number
+    builder = timeit.timeit(lambda: with_builder(instance, rows, texts), number=number) / number
+    print(f"{texts} texts + {cards} cards: models {models * 1e6:8.1f} us | builder {builder * 1e6:8.1f} us "
+          f"| {models / builder:5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--texts", type=int, default=20)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+    main(args.cards, args.texts, args.number)
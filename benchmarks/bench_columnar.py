@@ -0,0 +1,75 @@
+"""
+Throughput of the columnar builders by row count: escaped HTML tables with
+render_table versus per-row string concatenation, and card collections with
+cards_message versus one validated CardMessageModel per card.
+
+    python -m benchmarks.bench_columnar --rows 100 1000 10000 100000
+"""
+import argparse
+import html
+import time
+from typing import Callable, List
+
+from src.captivate_ai_api import CardMessageModel, cards_message, render_table
+from src.captivate_ai_api.Captivate import CardCollectionModel
+
+
+def make_columns(rows: int):
+    return {
+        "Order": [f"A-{i:06d}" for i in range(rows)],
+        "Customer": [f"Customer <{i}> & Co" for i in range(rows)],
+        "Total": [i * 1.25 for i in range(rows)],
+        "Shipped": [i % 3 == 0 for i in range(rows)],
+    }
+
+
+def concatenated_table(columns) -> str:
+    """What a handler typically writes by hand: one row at a time with +=."""
+    headers = list(columns)
+    out = "<table><thead><tr>"
+    for header in headers:
+        out += "<th>" + html.escape(header) + "</th>"
+    out += "</tr></thead><tbody>"
+    for index in range(len(columns[headers[0]])):
+        out += "<tr>"
+        for header in headers:
+            out += "<td>" + html.escape(str(columns[header][index])) + "</td>"
+        out += "</tr>"
+    return out + "</tbody></table>"
+
+
+def model_cards(columns) -> dict:
+    return CardCollectionModel(cards=[
+        CardMessageModel(text=text, description=description, image_url=f"https://e.x/{text}.png", link=f"https://e.x/{text}")
+        for text, description in zip(columns["Order"], columns["Customer"])
+    ]).model_dump()
+
+
+def columnar_cards(columns) -> dict:
+    orders = columns["Order"]
+    return cards_message(orders, columns["Customer"], [f"https://e.x/{o}.png" for o in orders], [f"https://e.x/{o}" for o in orders])
+
+
+def rate(func: Callable[[], object], rows: int) -> float:
+    number = max(1, 200_000 // rows)
+    started = time.perf_counter()
+    for _ in range(number):
+        func()
+    return rows * number / (time.perf_counter() - started)
+
+
+def main(row_counts: List[int]) -> None:
+    for rows in row_counts:
+        columns = make_columns(rows)
+        assert concatenated_table(columns) == render_table(columns)
+        assert model_cards(columns) == columnar_cards(columns)
+        concat, columnar = rate(lambda: concatenated_table(columns), rows), rate(lambda: render_table(columns), rows)
+        models, batched = rate(lambda: model_cards(columns), rows), rate(lambda: columnar_cards(columns), rows)
+        print(f"{rows:>7} rows | table: concat {concat:12,.0f} rows/s, render_table {columnar:12,.0f} rows/s ({columnar / concat:4.1f}x)"
+              f" | cards: models {models:12,.0f}/s, cards_message {batched:12,.0f}/s ({batched / models:4.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    main(parser.parse_args().rows)
@@ -0,0 +1,38 @@
+"""
+Captivate construction from a validated ChatRequest: the old
+Captivate(**request.model_dump()) path versus Captivate.create(request);
+and from raw request bytes: json.loads -> ChatRequest -> Captivate versus
+Captivate.from_json(bytes).
+
+    python -m benchmarks.bench_create --number 2000
+"""
+import argparse
+import json
+import timeit
+
+from src.captivate_ai_api import Captivate, ChatRequest
+from benchmarks.payloads import make_payload
+
+CASES = {
+    "data_action (3 files)": make_payload(files=3, text_size=512),
+    "10 files x 64 KB text": make_payload(files=10, text_size=64 * 1024),
+}
+
+
+def main(number: int) -> None:
+    for name, payload in CASES.items():
+        request = ChatRequest(**payload)
+        dump = timeit.timeit(lambda: Captivate(**request.model_dump()), number=number) / number
+        fast = timeit.timeit(lambda: Captivate.create(request), number=number) / number
+        print(f"{name:>24}: model_dump {dump * 1e6:8.1f} us | create {fast * 1e6:8.1f} us | {dump / fast:5.2f}x")
+
+        body = json.dumps(payload).encode()
+        pipeline = timeit.timeit(lambda: Captivate.create(ChatRequest(**json.loads(body))), number=number) / number
+        raw = timeit.timeit(lambda: Captivate.from_json(body), number=number) / number
+        print(f"{'':>24}  bytes->ChatRequest {pipeline * 1e6:8.1f} us | from_json {raw * 1e6:8.1f} us | {pipeline / raw:5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    main(parser.parse_args().number)
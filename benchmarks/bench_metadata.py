@@ -0,0 +1,33 @@
+"""
+Cost of set_metadata / set_private_metadata with large values: the previous
+json.dumps-based serializability check versus the current type walk.
+
+    python -m benchmarks.bench_metadata --number 50
+"""
+import argparse
+import json
+import timeit
+
+from src.captivate_ai_api import Captivate
+from benchmarks.payloads import make_payload
+
+CASES = {
+    "1 MB transcript string": "x" * 1_000_000,
+    "200 turns x 2 KB": [{"role": "user", "content": "é" * 2000, "ts": 1.5} for _ in range(200)],
+    "100 retrieved documents": {"docs": [{"id": i, "text": "lorem ipsum " * 500, "meta": {"score": 0.5, "tags": ["a", "b"]}} for i in range(100)]},
+    "10k small records": [{"a": 1, "b": "x", "c": [1, 2, 3]} for _ in range(10_000)],
+}
+
+
+def main(number: int) -> None:
+    instance = Captivate.create(make_payload())
+    for name, value in CASES.items():
+        legacy = timeit.timeit(lambda: (json.dumps({"key": "test"}), json.dumps(value)), number=number) / number
+        current = timeit.timeit(lambda: instance.set_metadata("key", value), number=number) / number
+        print(f"{name:>24}: json.dumps {legacy * 1e3:8.3f} ms | set_metadata {current * 1e3:8.3f} ms | {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=50)
+    main(parser.parse_args().number)
@@ -0,0 +1,57 @@
+"""
+Requests per second for async_send_message against a local stub server,
+with a fresh connection per call versus the shared pooled client.
+
+    python -m benchmarks.bench_pooling --requests 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from src.captivate_ai_api import Captivate, CaptivateClient, TextMessageModel
+from benchmarks.payloads import make_payload
+from benchmarks.stub_server import StubServer
+
+
+def make_instance(url: str) -> Captivate:
+    instance = Captivate.create(make_payload())
+    Captivate.DEV_URL_V2 = url
+    instance.set_response([TextMessageModel(text="Hello from the benchmark")])
+    return instance
+
+
+async def run(requests: int, concurrency: int, pooled: bool) -> float:
+    async with StubServer() as server:
+        instance = make_instance(server.url + "/api/channel/v2/sendMessage")
+        shared = CaptivateClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send_one():
+            async with semaphore:
+                if pooled:
+                    await instance.async_send_message(client=shared)
+                else:
+                    async with CaptivateClient() as client:
+                        await instance.async_send_message(client=client)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send_one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        await shared.aclose()
+        print(f"{'pooled' if pooled else 'unpooled':>9}: {requests / elapsed:8.1f} req/s "
+              f"({server.connections} connections for {requests} requests)")
+        return requests / elapsed
+
+
+async def main(requests: int, concurrency: int) -> None:
+    unpooled = await run(requests, concurrency, pooled=False)
+    pooled = await run(requests, concurrency, pooled=True)
+    print(f"  speedup: {pooled / unpooled:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,59 @@
+"""
+Validation of CaptivateResponseModel with many messages: the previous untagged
+Union of message models versus the discriminated union keyed on 'type'.
+
+    python -m benchmarks.bench_response --messages 60 --number 500
+"""
+import argparse
+import timeit
+from typing import List, Union
+
+from src.captivate_ai_api import Captivate, TextMessageModel, ButtonMessageModel, TableMessageModel, HtmlMessageModel, CaptivateResponseModel
+from src.captivate_ai_api.Captivate import FileCollectionModel, CardCollectionModel
+from benchmarks.payloads import make_payload
+
+
+class LegacyResponseModel(CaptivateResponseModel):
+    response: List[
+        Union[
+            TextMessageModel,
+            FileCollectionModel,
+            ButtonMessageModel,
+            TableMessageModel,
+            CardCollectionModel,
+            HtmlMessageModel,
+            dict,
+        ]
+    ] = []
+
+
+def make_messages(count: int) -> List[dict]:
+    samples = [
+        {"type": "text", "text": "Hello there"},
+        {"type": "button", "buttons": {"title": "Learn More", "options": [{"label": "Yes", "value": "Yes"}]}},
+        {"type": "table", "table": "<table><tr><td>1</td></tr></table>"},
+        {"type": "cards", "cards": [{"text": "Offer", "description": "20% off", "image_url": "https://e.x/i.png", "link": "https://e.x"}]},
+        {"type": "html", "html": "<h2>Highlights</h2>"},
+        {"type": "files", "files": [{"type": "application/pdf", "url": "https://e.x/m.pdf", "filename": "m.pdf"}]},
+        {"type": "policy_assesment_id", "id": "12345"},
+    ]
+    return [dict(samples[i % len(samples)]) for i in range(count)]
+
+
+def main(messages: int, number: int) -> None:
+    captivate = Captivate.create(make_payload())
+    captivate.set_response(make_messages(messages))
+    data = captivate.get_response()
+
+    legacy = timeit.timeit(lambda: LegacyResponseModel.model_validate(data), number=number) / number
+    tagged = timeit.timeit(lambda: CaptivateResponseModel.model_validate(data), number=number) / number
+    print(f"{messages} messages: untagged union {legacy * 1e6:8.1f} us | discriminated {tagged * 1e6:8.1f} us "
+          f"| {legacy / tagged:5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=60)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+    main(args.messages, args.number)
@@ -0,0 +1,54 @@
+"""
+Session snapshot save/restore latency and size: the binary snapshot used by
+the session stores versus a model_dump_json / model_validate_json round trip.
+
+    python -m benchmarks.bench_session --number 2000
+"""
+import argparse
+import timeit
+
+from src.captivate_ai_api import Captivate, MemorySessionStore
+from src.captivate_ai_api.Captivate import MetadataModel
+from src.captivate_ai_api.session import dump_snapshot, load_snapshot
+from benchmarks.payloads import make_payload
+
+STATE = {"turn": 12, "intent": "refund", "slots": {"order_id": "A-1234", "amount": 49.9}, "history": ["greet", "ask"] * 10}
+
+
+def make_instance(size: str) -> Captivate:
+    instance = Captivate.create(make_payload())
+    if size == "large":
+        instance.set_metadata("documents", [{"id": i, "text": "lorem ipsum " * 40, "score": 0.5} for i in range(50)])
+        instance.set_metadata("history", [{"role": "user", "content": "hello " * 20, "ts": 1.5} for _ in range(40)])
+    return instance
+
+
+def main(number: int) -> None:
+    for size in ("small", "large"):
+        instance = make_instance(size)
+        metadata = instance.metadata
+        as_json = metadata.model_dump_json().encode()
+        snapshot = dump_snapshot(metadata.model_dump(), STATE)
+
+        json_save = timeit.timeit(lambda: metadata.model_dump_json(), number=number) / number
+        snap_save = timeit.timeit(lambda: dump_snapshot(metadata.model_dump(), STATE), number=number) / number
+        json_load = timeit.timeit(lambda: MetadataModel.model_validate_json(as_json), number=number) / number
+        snap_load = timeit.timeit(lambda: MetadataModel.model_validate(load_snapshot(snapshot).metadata), number=number) / number
+        raw_load = timeit.timeit(lambda: load_snapshot(snapshot), number=number) / number
+
+        store = MemorySessionStore()
+        store_round_trip = timeit.timeit(
+            lambda: (instance.save_session(STATE, store=store), instance.restore_session(store=store)), number=number
+        ) / number
+
+        print(f"[{size}] size: json {len(as_json):7d} B (metadata only) | snapshot {len(snapshot):7d} B (metadata + state)")
+        print(f"[{size}] save:    model_dump_json {json_save * 1e6:8.1f} us | snapshot {snap_save * 1e6:8.1f} us")
+        print(f"[{size}] restore: model_validate_json {json_load * 1e6:8.1f} us | snapshot {snap_load * 1e6:8.1f} us "
+              f"(decode only {raw_load * 1e6:.1f} us)")
+        print(f"[{size}] save_session + restore_session on MemorySessionStore: {store_round_trip * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    main(parser.parse_args().number)
@@ -0,0 +1,69 @@
+"""
+Oversized responses against a local size-limited stub endpoint: checks that
+get_response_parts keeps every part under the budget and in order, and times
+the split against a single get_response_json.
+
+    python -m benchmarks.bench_split --messages 400 --max-bytes 16384
+"""
+import argparse
+import asyncio
+import json
+import timeit
+
+from src.captivate_ai_api import ActionModel, Captivate, CaptivateClient, render_table
+from benchmarks.bench_response import make_messages
+from benchmarks.payloads import make_payload
+from benchmarks.stub_server import StubServer
+
+
+class SizeLimitedServer(StubServer):
+    """Rejects bodies above max_bytes with 413, like the channel API's payload limit."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__()
+        self.max_bytes = max_bytes
+
+    def handle_request(self, method, path, headers, body):
+        if len(body) > self.max_bytes:
+            return 413, {"Content-Type": "application/json"}, b'{"ok": false}'
+        return super().handle_request(method, path, headers, body)
+
+
+def make_instance(messages: int) -> Captivate:
+    instance = Captivate.create(make_payload(files=2, text_size=256))
+    rows = list(range(200))
+    instance.set_response(make_messages(messages) + [{"type": "table", "table": render_table({"n": rows, "sq": [r * r for r in rows]})}])
+    instance.set_outgoing_action([ActionModel(id="done")])
+    return instance
+
+
+async def check(instance: Captivate, max_bytes: int) -> None:
+    async with SizeLimitedServer(max_bytes) as server, CaptivateClient() as client:
+        Captivate.DEV_URL_V2 = server.url + "/api/channel/v2/sendMessage"
+        await instance.async_send_message(client=client, max_bytes=max_bytes)
+        parts = [json.loads(request["body"]) for request in server.requests]
+
+    expected = instance.get_response()
+    assert [message for part in parts for message in part["response"]] == json.loads(instance.get_response_json())["response"]
+    assert [part["part"] for part in parts] == [{"index": i, "total": len(parts)} for i in range(len(parts))]
+    assert all(part["outgoing_action"] is None for part in parts[:-1])
+    assert parts[-1]["outgoing_action"] == expected["outgoing_action"]
+    sizes = [len(request["body"]) for request in server.requests]
+    print(f"{len(instance.get_response_json())} bytes sent as {len(parts)} parts of at most {max(sizes)} bytes (budget {max_bytes})")
+
+
+def main(messages: int, max_bytes: int, number: int) -> None:
+    instance = make_instance(messages)
+    asyncio.run(check(instance, max_bytes))
+    single = timeit.timeit(instance.get_response_json, number=number) / number
+    split = timeit.timeit(lambda: instance.get_response_parts(max_bytes), number=number) / number
+    print(f"get_response_json {single * 1e6:8.1f} us | get_response_parts {split * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--max-bytes", type=int, default=16384)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+    main(args.messages, args.max_bytes, args.number)
@@ -0,0 +1,71 @@
+"""
+Time to first delivered text for a simulated token-by-token LLM answer:
+stream_text() versus set_response() + async_send_message() after the whole
+answer, against a local stub endpoint that records the streamed parts.
+
+    python -m benchmarks.bench_stream --tokens 200 --token-delay 0.005
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from src.captivate_ai_api import Captivate, CaptivateClient, TextMessageModel
+from benchmarks.payloads import make_payload
+from benchmarks.stub_server import StubServer
+
+
+async def generate(tokens: int, token_delay: float):
+    for index in range(tokens):
+        await asyncio.sleep(token_delay)
+        yield f"token{index} "
+
+
+async def run(tokens: int, token_delay: float, min_chars: int, max_delay: float) -> None:
+    async with StubServer() as server:
+        first_request = None
+
+        def record(method, path, headers, body):
+            nonlocal first_request
+            if first_request is None:
+                first_request = time.perf_counter()
+            server.requests.append({"method": method, "path": path, "headers": headers, "body": body})
+            return 200, {"Content-Type": "application/json"}, server.response_body
+
+        server.handle_request = record
+        async with CaptivateClient() as client:
+            instance = Captivate.create(make_payload())
+            Captivate.DEV_URL_V2 = server.url + "/api/channel/v2/sendMessage"
+
+            started = time.perf_counter()
+            answer = "".join([token async for token in generate(tokens, token_delay)])
+            instance.set_response([TextMessageModel(text=answer)])
+            await instance.async_send_message(client=client)
+            blocking = first_request - started
+
+            server.requests.clear()
+            first_request = None
+            started = time.perf_counter()
+            async with instance.stream_text(client=client, min_chars=min_chars, max_delay=max_delay) as stream:
+                async for token in generate(tokens, token_delay):
+                    await stream.write(token)
+            streaming = first_request - started
+            total = time.perf_counter() - started
+
+    parts = [json.loads(request["body"])["response"][0] for request in server.requests]
+    assert "".join(part["text"] for part in parts) == answer
+    assert [part["stream"]["seq"] for part in parts] == list(range(len(parts)))
+    assert parts[-1]["stream"]["final"] and not any(part["stream"]["final"] for part in parts[:-1])
+    print(f"   blocking send: first text after {blocking * 1000:8.1f} ms")
+    print(f"  streaming send: first text after {streaming * 1000:8.1f} ms "
+          f"({len(parts)} parts, whole answer delivered after {total * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--min-chars", type=int, default=80)
+    parser.add_argument("--max-delay", type=float, default=0.25)
+    args = parser.parse_args()
+    asyncio.run(run(args.tokens, args.token_delay, args.min_chars, args.max_delay))
@@ -0,0 +1,55 @@
+"""
+Request payloads shared by the benchmarks, shaped like the `data_action`
+example in main.py.
+"""
+import copy
+from typing import Any, Dict
+
+
+def make_file(index: int, text_size: int = 512) -> Dict[str, Any]:
+    filename = f"document_{index}.pdf"
+    return {
+        "filename": filename,
+        "type": "application/pdf",
+        "file": {},
+        "textContent": {
+            "type": "file_content",
+            "text": ("EU REGULATIONS 2024 " * (text_size // 20 + 1))[:text_size],
+            "metadata": {
+                "source": "file_attachment",
+                "originalFileName": filename,
+                "storageType": "direct",
+            },
+        },
+        "storage": {
+            "fileKey": f"uploads/1704067200000-{index:06d}-{filename}",
+            "presignedUrl": f"https://s3.amazonaws.com/bucket/uploads/{filename}?X-Amz-Algorithm=AWS4-HMAC-SHA256",
+            "expiresIn": 1704070800,
+            "fileSize": text_size,
+            "processingTime": 5,
+        },
+    }
+
+
+def make_payload(session_id: str = "bench-session", files: int = 0, text_size: int = 512) -> Dict[str, Any]:
+    return copy.deepcopy({
+        "session_id": session_id,
+        "user_input": "tell me about EU regulations",
+        "files": [make_file(i, text_size) for i in range(files)] or None,
+        "incoming_action": [
+            {"id": "sendEmail", "payload": {"email": "user@example.com", "message": "hello"}}
+        ],
+        "metadata": {
+            "internal": {
+                "channelMetadata": {
+                    "channelMetadata": {"channel": "custom-channel", "channelData": {}},
+                    "user": {"firstName": "Lance", "lastName": "safa", "email": "user@example.com"},
+                    "custom": {
+                        "mode": "non-dbfred",
+                        "title": {"type": "title", "title": "Latest Updates on EU Regulations"},
+                    },
+                }
+            }
+        },
+        "hasLivechat": False,
+    })
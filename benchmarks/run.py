@@ -0,0 +1,188 @@
+"""
+Benchmark suite for the Captivate hot paths. Results are written as JSON and
+compared against a stored baseline so regressions show up before a release.
+
+    python -m benchmarks.run                                # run and compare with benchmarks/baseline.json
+    python -m benchmarks.run --output results.json          # also save the results
+    python -m benchmarks.run --update-baseline              # store the results as the new baseline
+    python -m benchmarks.run --update-baseline --runs 4     # ... keeping each case's slowest of 4 runs
+    python -m benchmarks.run --filter create --tolerance 0.3
+
+The exit status is 1 when a case is slower than its baseline by more than the
+tolerance. Baselines are machine specific: refresh them on the machine that
+runs the comparison, and in the same commit as any change that moves the
+numbers. On a noisy machine, record the baseline over several runs so a
+single fast run does not become the reference.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from src.captivate_ai_api import Captivate, CaptivateClient, ChatRequest, TextMessageModel
+from benchmarks.bench_response import make_messages
+from benchmarks.payloads import make_payload
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+REPEAT = 7
+
+
+class Case:
+    def __init__(self, name: str, func: Callable[[], Any], number: int, is_async: bool = False):
+        self.name = name
+        self.func = func
+        self.number = number
+        self.is_async = is_async
+
+
+def stub_transport(file_size: int = 1024 * 1024) -> httpx.MockTransport:
+    """In-process stand-in for the channel API and file storage: no sockets involved."""
+    file_body = b"x" * file_size
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(200, json={"ok": True})
+        return httpx.Response(200, content=file_body)
+
+    return httpx.MockTransport(handler)
+
+
+def build_cases() -> List[Case]:
+    payloads = {
+        "tiny": make_payload(),
+        "data_action": make_payload(files=3, text_size=512),
+        "10_large_files": make_payload(files=10, text_size=64 * 1024),
+    }
+    cases = []
+    for name, payload in payloads.items():
+        request = ChatRequest(**payload)
+        body = json.dumps(payload).encode()
+        cases.append(Case(f"create_dict[{name}]", lambda p=payload: Captivate.create(p), 2000))
+        cases.append(Case(f"create_chat_request[{name}]", lambda r=request: Captivate.create(r), 2000))
+        cases.append(Case(f"from_json[{name}]", lambda b=body: Captivate.from_json(b), 500))
+
+    instance = Captivate.create(payloads["data_action"])
+    large_values = {
+        "transcript_1mb": "x" * 1_000_000,
+        "documents_100": {"docs": [{"id": i, "text": "lorem ipsum " * 500, "meta": {"score": 0.5}} for i in range(100)]},
+    }
+    for name, value in large_values.items():
+        cases.append(Case(f"set_metadata[{name}]", lambda v=value: instance.set_metadata("key", v), 200))
+
+    messages = make_messages(60)
+
+    def set_and_get_response():
+        responder = Captivate.create(payloads["data_action"])
+        responder.set_response(messages)
+        return responder.get_response()
+
+    def set_and_get_response_json():
+        responder = Captivate.create(payloads["data_action"])
+        responder.set_response(messages)
+        return responder.get_response_json()
+
+    cases.append(Case("set_response+get_response[60]", set_and_get_response, 500))
+    cases.append(Case("set_response+get_response_json[60]", set_and_get_response_json, 500))
+
+    client = CaptivateClient(transport=stub_transport())
+    sender = Captivate.create(payloads["data_action"])
+    sender.set_response([TextMessageModel(text="Hello from the benchmark")])
+    file_info = {"url": "http://stub/file.bin", "storage": {"fileSize": 1024 * 1024}}
+    cases.append(Case("async_send_message", lambda: sender.async_send_message(client=client), 500, is_async=True))
+    cases.append(Case("download_file_to_memory[1mb]", lambda: sender.download_file_to_memory(file_info, client=client), 200, is_async=True))
+    return cases
+
+
+def measure(case: Case, loop: asyncio.AbstractEventLoop) -> Dict[str, Any]:
+    if case.is_async:
+        async def run_batch(number: int) -> float:
+            started = time.perf_counter()
+            for _ in range(number):
+                await case.func()
+            return time.perf_counter() - started
+
+        loop.run_until_complete(run_batch(max(1, case.number // 10)))  # Warm up
+        timings = [loop.run_until_complete(run_batch(case.number)) for _ in range(REPEAT)]
+    else:
+        timeit.timeit(case.func, number=max(1, case.number // 10))  # Warm up
+        timings = timeit.repeat(case.func, number=case.number, repeat=REPEAT)
+    per_call = [t / case.number * 1e6 for t in timings]
+    return {"min_us": min(per_call), "mean_us": sum(per_call) / len(per_call), "number": case.number, "repeat": REPEAT}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference is None:
+            print(f"  {name:<40} {result['min_us']:12.1f} us   (no baseline)")
+            continue
+        change = result["min_us"] / reference["min_us"] - 1
+        flag = "REGRESSION" if change > tolerance else ""
+        print(f"  {name:<40} {result['min_us']:12.1f} us   {change:+7.1%} vs {reference['min_us']:.1f} us {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%).")
+    parser.add_argument("--filter", help="Only run cases whose name contains this string.")
+    parser.add_argument("--runs", type=int, default=1, help="Measure this many times, keeping each case's slowest minimum.")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in build_cases() if not args.filter or args.filter in case.name]
+    loop = asyncio.new_event_loop()
+    try:
+        measured: Dict[str, Any] = {}
+        for _ in range(max(1, args.runs)):
+            for case in cases:
+                result = measure(case, loop)
+                if case.name not in measured or result["min_us"] > measured[case.name]["min_us"]:
+                    measured[case.name] = result
+        results = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "runs": max(1, args.runs),
+            },
+            "cases": measured,
+        }
+    finally:
+        loop.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Minimal in-process HTTP/1.1 server used by the benchmarks as a stand-in for
+the channel API and file storage. It supports keep-alive so pooled and
+unpooled clients can be compared fairly.
+"""
+import asyncio
+import gzip
+import json
+from typing import Any, Dict, List, Optional
+
+
+class StubServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, response_body: bytes = b'{"ok": true}'):
+        self.host = host
+        self.port = port
+        self.response_body = response_body
+        self.requests: List[Dict[str, Any]] = []
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def handle_request(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        """Returns (status, headers, body). Override to customise the stub."""
+        self.requests.append({"method": method, "path": path, "headers": headers, "body": body})
+        return 200, {"Content-Type": "application/json"}, self.response_body
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, value = line.decode("latin-1").split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                body = decode_body(body, headers.get("content-encoding"))
+
+                result = self.handle_request(method, path, headers, body)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                status, response_headers, response_body = result
+                head = [f"HTTP/1.1 {status} OK", f"Content-Length: {len(response_body)}"]
+                head += [f"{name}: {value}" for name, value in response_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + response_body)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Client went away, or the loop is shutting down with idle keep-alive connections
+            pass
+        finally:
+            writer.close()
+
+
+def json_body(request: Dict[str, Any]) -> Any:
+    return json.loads(request["body"])
+
+
+def decode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    """Undoes a request Content-Encoding, like the channel API would."""
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(body)
+    return body
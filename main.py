@@ -1,10 +1,11 @@
 from src.captivate_ai_api.Captivate import ActionModel, Captivate, FileCollectionModel,CardCollectionModel,CardMessageModel, FileModel, HtmlMessageModel, TableMessageModel, TextMessageModel,ButtonMessageModel, CaptivateResponseModel, ChatRequest
 import asyncio
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, ValidationError
 from typing import Optional, List, Dict, Any
 import uvicorn
 import time
+from src.captivate_ai_api.responses import CaptivateJSONResponse
 app = FastAPI(title="Captivate AI API", version="1.0.0")
 
 # Original test data
@@ -161,6 +162,32 @@ async def chat(request: ChatRequest):
         print(e)
         raise HTTPException(status_code=500, detail=f"Error sending message: {str(e)}")
 
+@app.post("/chat-raw", response_model=CaptivateResponseModel, response_class=CaptivateJSONResponse)
+async def chat_raw(request: Request):
+    """
+    Chat endpoint that parses the raw request body straight into Captivate,
+    skipping FastAPI's JSON decoding and the intermediate ChatRequest, and
+    returns the response serialized exactly once.
+    """
+    try:
+        captivate_instance = Captivate.from_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    except ValueError as e:  # Not JSON at all
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        files = captivate_instance.get_files() or []
+        messages = [
+            TextMessageModel(text=f"This is a text response from lance local ({len(files)} file(s) received)"),
+        ]
+        captivate_instance.set_response(messages)
+        return CaptivateJSONResponse(captivate_instance.get_response_json())
+
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail=f"Error sending message: {str(e)}")
+
 @app.get("/")
 async def root():
     """
@@ -171,6 +198,7 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/chat": "POST - Main chat endpoint",
+            "/chat-raw": "POST - Chat endpoint parsing the raw body with Captivate.from_json",
             "/health": "GET - Health check",
             "/test-file-handling": "GET - Test file handling functionality",
             "/test-router-mode": "GET - Test router mode functionality with decorator pattern"
@@ -21,6 +21,10 @@ setup(
         'pydantic>=2.5.0',
         'httpx>=0.25.2'
     ],
+    extras_require={
+        'http2': ['httpx[http2]>=0.25.2'],
+        'zstd': ['zstandard>=0.21.0'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
@@ -1,9 +1,24 @@
-import httpx
-from pydantic import BaseModel, EmailStr, model_validator, Field, RootModel
-from typing import Optional, Dict, Any, List, Union
+from pydantic import BaseModel, EmailStr, model_validator, Field, RootModel, Discriminator, Tag, field_serializer, ValidationError, ValidatorFunctionWrapHandler, WrapValidator
+from typing_extensions import Annotated
+from typing import Optional, Dict, Any, List, Union, AsyncIterator, BinaryIO, ClassVar
 import io
 import json
+import hashlib
+import asyncio
+import time
+import secrets
 from functools import wraps
+from .builders import ResponseBuilder
+from .client import CaptivateClient, _resolve_client
+from .dispatch import ActionDispatcher, DispatchResult, get_default_dispatcher
+from .parts import pack_parts
+from .sender import BackgroundSender, get_default_sender
+from .session import SessionStore, get_session_store
+from .stream import DEFAULT_STREAM_MAX_DELAY, DEFAULT_STREAM_MIN_CHARS, TextStream
+from .serialization import dump_json, dump_json_data, dump_json_joined
+from .instrumentation import span, STAGE_CREATE, STAGE_METADATA, STAGE_SERIALIZE, STAGE_SEND, STAGE_DOWNLOAD
+from .cache import AttachmentCache, get_attachment_cache
+from .files import DEFAULT_CHUNK_SIZE, DEFAULT_SPOOL_THRESHOLD, FileDownloadResult, download_to_buffer, iter_file_chunks, spooled_buffer
 
 def requires_router_mode(func):
     """Decorator to ensure router mode is enabled for specific methods."""
@@ -79,11 +94,44 @@ class UserModel(BaseModel):
     email: Optional[str] = None
 
 
+def _check_json_value(value: Any, markers: set) -> None:
+    """
+    Walks a value and raises the same errors json.dumps would, without building
+    the JSON string. Strings are accepted in O(1) regardless of their length.
+    `markers` holds the ids of the containers on the current path, to detect cycles.
+    """
+    if isinstance(value, dict):
+        if id(value) in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(id(value))
+        for k, v in value.items():
+            if not isinstance(k, (str, int, float)) and k is not None:
+                raise TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}")
+            value_type = type(v)
+            if value_type is not str and value_type is not int and value_type is not float and value_type is not bool and v is not None:
+                _check_json_value(v, markers)
+        markers.discard(id(value))
+    elif isinstance(value, (list, tuple)):
+        if id(value) in markers:
+            raise ValueError("Circular reference detected")
+        markers.add(id(value))
+        for v in value:
+            value_type = type(v)
+            if value_type is not str and value_type is not int and value_type is not float and value_type is not bool and v is not None:
+                _check_json_value(v, markers)
+        markers.discard(id(value))
+    elif not isinstance(value, (str, int, float)) and value is not None:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 def _validate_json_serializable(key: str, value: Any) -> None:
     """
     Validates that both key and value can be JSON serialized.
     Rejects keys starting with '$' as they are often used for special operators
     (e.g., MongoDB operators like $gt, $lt) and can cause issues in JSON decoding.
+
+    The value is checked with a type walk instead of json.dumps, so large strings
+    and nested structures are validated without building (and discarding) their JSON.
     
     Args:
         key: The key to validate
@@ -101,16 +149,10 @@ def _validate_json_serializable(key: str, value: Any) -> None:
     if key.startswith('$'):
         raise ValueError(f"Key '{key}' cannot start with '$' as it may cause issues with JSON decoding. Keys starting with '$' are reserved for special operators.")
     
-    # Try to serialize the key as a JSON string key
-    try:
-        json.dumps({key: "test"})
-    except (TypeError, ValueError) as e:
-        raise ValueError(f"Key '{key}' cannot be JSON serialized: {str(e)}")
-    
     # Validate value can be JSON serialized
     try:
-        json.dumps(value)
-    except (TypeError, ValueError) as e:
+        _check_json_value(value, set())
+    except (TypeError, ValueError, RecursionError) as e:
         raise ValueError(f"Value for key '{key}' cannot be JSON serialized: {str(e)}")
 
 
@@ -122,6 +164,16 @@ class ChannelMetadataModel(BaseModel):
     conversationCreatedAt: Optional[str] = None  # ISO8601 format for dates
     conversationUpdatedAt: Optional[str] = None  # ISO8601 format for dates
     _agents_list_set: bool = False  # Track if agents_list has been set
+    # Keys set (True) or removed (False) through the setters since construction, per section, for delta sends
+    _changes: Dict[str, Dict[str, bool]] = {"custom": {}, "private": {}}
+
+    # The setters read __pydantic_private__ directly: a plain `self._changes` lookup goes
+    # through pydantic's __getattr__ fallback, which costs more than the setter itself.
+    def _mark_set(self, section: str, key: str) -> None:
+        self.__pydantic_private__["_changes"][section][key] = True
+
+    def _mark_removed(self, section: str, key: str) -> None:
+        self.__pydantic_private__["_changes"][section][key] = False
 
     def set_custom(self, key: str, value: Any):
         """
@@ -140,6 +192,7 @@ class ChannelMetadataModel(BaseModel):
         _validate_json_serializable(key, value)
         
         self.custom[key] = value
+        self._mark_set("custom", key)
 
     def get_custom(self, key: str) -> Optional[Any]:
         if key in self.private:
@@ -154,8 +207,10 @@ class ChannelMetadataModel(BaseModel):
         """
         if key in self.private:
             del self.private[key]
+            self._mark_removed("private", key)
         if key in self.custom:
             del self.custom[key]
+            self._mark_removed("custom", key)
 
     def set_agents(self, agents_list: List[str]) -> None:
         """
@@ -169,6 +224,7 @@ class ChannelMetadataModel(BaseModel):
         
         self.custom["agents_list"] = agents_list
         self._agents_list_set = True
+        self._mark_set("custom", "agents_list")
 
     def get_agents(self) -> Optional[List[str]]:
         """
@@ -191,6 +247,8 @@ class ChannelMetadataModel(BaseModel):
         # Directly set reserved keys to allow internal logic
         self.custom["title"] = title_data  # this is to support old version
         self.custom["conversation_title"] = title
+        self._mark_set("custom", "title")
+        self._mark_set("custom", "conversation_title")
 
     def get_conversation_title(self) -> Optional[Dict[str, Any]]:
         """
@@ -223,6 +281,7 @@ class ChannelMetadataModel(BaseModel):
         _validate_json_serializable(key, value)
         
         self.private[key] = value
+        self._mark_set("private", key)
 
     def get_private_metadata(self, key: str) -> Optional[Any]:
         """
@@ -230,6 +289,68 @@ class ChannelMetadataModel(BaseModel):
         """
         return self.private.get(key)
 
+    def has_changes(self) -> bool:
+        """
+        Returns True if any custom or private key was set or removed since construction.
+        Only changes made through the setters are tracked, not direct edits of the dicts.
+        """
+        return any(self._changes.values())
+
+    def get_changes(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the custom and private keys set or removed since construction.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {"custom": {"set": {...}, "removed": [...]}, "private": {...}}
+        """
+        changes = {}
+        for section, values in (("custom", self.custom), ("private", self.private)):
+            marks = self._changes[section]
+            changes[section] = {
+                "set": {key: values[key] for key, is_set in marks.items() if is_set and key in values},
+                "removed": [key for key, is_set in marks.items() if not is_set],
+            }
+        return changes
+
+    def clear_changes(self) -> None:
+        """Forgets tracked changes, e.g. after a delta has been delivered."""
+        self._changes = {"custom": {}, "private": {}}
+
+    def delta_dump(self) -> Dict[str, Any]:
+        """
+        Dumps the metadata for a delta send: every field in full except custom and
+        private, which only carry the keys set since construction, plus a 'removed'
+        object listing the keys removed from each. See apply_metadata_delta.
+        """
+        changes = self.get_changes()
+        data = self.model_dump(exclude={"custom", "private"})
+        data["custom"] = changes["custom"]["set"]
+        data["private"] = changes["private"]["set"]
+        data["removed"] = {"custom": changes["custom"]["removed"], "private": changes["private"]["removed"]}
+        return data
+
+
+def apply_metadata_delta(metadata: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges the metadata of a delta send into the previous full metadata, the way the
+    receiving side is expected to. Returns a new dict; the inputs are left untouched.
+
+    Args:
+        metadata: Full metadata ({"internal": {"channelMetadata": {...}}}) known to the receiver.
+        delta: The 'metadata' of a payload sent with metadataMode == "delta".
+    """
+    base = (metadata.get("internal") or {}).get("channelMetadata") or {}
+    changes = dict((delta.get("internal") or {}).get("channelMetadata") or {})
+    removed = changes.pop("removed", None) or {}
+
+    merged = {**base, **{k: v for k, v in changes.items() if k not in ("custom", "private")}}
+    for section in ("custom", "private"):
+        values = {**(base.get(section) or {}), **(changes.get(section) or {})}
+        for key in removed.get(section, []):
+            values.pop(key, None)
+        merged[section] = values
+    return {**metadata, "internal": {**(metadata.get("internal") or {}), "channelMetadata": merged}}
+
 
 class InternalMetadataModel(BaseModel):
     channelMetadata: ChannelMetadataModel
@@ -264,23 +385,86 @@ class ActionModel(BaseModel):
         )
 
 
+# Required fields of the message models by their 'type' field, for O(1) dispatch when validating responses
+_MESSAGE_TYPES = {
+    model.model_fields["type"].default: frozenset(name for name, field in model.model_fields.items() if field.is_required())
+    for model in (TextMessageModel, FileCollectionModel, ButtonMessageModel, TableMessageModel, CardCollectionModel, HtmlMessageModel)
+}
+
+
+def _message_type(message: Any) -> str:
+    """
+    Discriminator for response messages: the 'type' field for the predefined
+    message types, 'dict' for anything else (custom types such as policy_assesment_id).
+    A dict whose type names a predefined model but lacks that model's required
+    fields (e.g. a flat {"type": "cards", "text": ...}) is kept as a dict too.
+    """
+    if isinstance(message, dict):
+        message_type = message.get("type")
+        required = _MESSAGE_TYPES.get(message_type)
+        return message_type if required is not None and required.issubset(message.keys()) else "dict"
+    message_type = getattr(message, "type", None)
+    return message_type if message_type in _MESSAGE_TYPES else "dict"
+
+
+def _message_or_dict(message: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+    """
+    Keeps a dict whose 'type' names a predefined model but whose values do not fit
+    it (e.g. {"type": "text", "text": None}) as a plain dict, like the untagged union did.
+    """
+    try:
+        return handler(message)
+    except ValidationError:
+        if isinstance(message, dict):
+            return message
+        raise
+
+
+ResponseMessage = Annotated[
+    Union[
+        Annotated[TextMessageModel, Tag("text")],
+        Annotated[FileCollectionModel, Tag("files")],
+        Annotated[ButtonMessageModel, Tag("button")],
+        Annotated[TableMessageModel, Tag("table")],
+        Annotated[CardCollectionModel, Tag("cards")],
+        Annotated[HtmlMessageModel, Tag("html")],
+        Annotated[dict, Tag("dict")],
+    ],
+    Discriminator(_message_type),
+    WrapValidator(_message_or_dict),
+]
+
+
 class CaptivateResponseModel(BaseModel):
-    response: List[
-        Union[
-            TextMessageModel,
-            FileCollectionModel,
-            ButtonMessageModel,
-            TableMessageModel,
-            CardCollectionModel,
-            HtmlMessageModel,
-            dict,
-        ]
-    ] = []  # List of responses Default to an empty list
+    response: List[ResponseMessage] = []  # List of responses Default to an empty list
     session_id: str  # Session ID to identify the conversation
     metadata: MetadataModel  # Updated metadata
     outgoing_action: Optional[List[ActionModel]] = None  # Optional actions to taken such as redirecting user to website
     hasLivechat: bool  # Whether there is live chat available
 
+    @field_serializer("response", mode="wrap", when_used="json")
+    def _serialize_response(self, messages: List[Any], handler):
+        # Lists of plain dicts (e.g. from ResponseBuilder) are already in wire format: encoding them
+        # directly skips matching every item against the message models. JSON only, so
+        # model_dump() still returns copies.
+        if all(type(message) is dict for message in messages):
+            return messages
+        return handler(messages)
+
+
+class _ChatRequestBody(BaseModel):
+    """
+    Request-only schema used by Captivate.from_json: the fields of ChatRequest, with
+    metadata and incoming_action typed so the raw body is validated in one pass.
+    Anything else in the body (e.g. 'response') is ignored.
+    """
+    session_id: str
+    user_input: Optional[str] = None
+    files: Optional[List[Dict[str, Any]]] = None
+    incoming_action: Optional[List[ActionModel]] = None
+    metadata: MetadataModel
+    hasLivechat: bool = False
+
 
 class Captivate(BaseModel):
     session_id: str
@@ -291,13 +475,15 @@ class Captivate(BaseModel):
     hasLivechat: bool
     response: Optional[CaptivateResponseModel] = None
     _router_mode: bool = False  # Track if router mode is enabled
+    _response_seq: int = 0  # Bumped whenever the response messages or actions change
+    _idempotency_token: Optional[str] = None  # Random per-instance part of the idempotency key
 
-    # API URLs as constants
-    DEV_URL: str = Field(default="https://channel.dev.captivat.io/api/channel/sendMessage", exclude=True)
-    PROD_URL: str = Field(default="https://channel.prod.captivat.io/api/channel/sendMessage", exclude=True)
+    # API URLs as constants (ClassVar, so request data can never override them)
+    DEV_URL: ClassVar[str] = "https://channel.dev.captivat.io/api/channel/sendMessage"
+    PROD_URL: ClassVar[str] = "https://channel.prod.captivat.io/api/channel/sendMessage"
     
-    DEV_URL_V2: str = Field(default="https://channel.dev.captivat.io/api/channel/v2/sendMessage", exclude=True)
-    PROD_URL_V2: str = Field(default="https://channel.prod.captivat.io/api/channel/v2/sendMessage", exclude=True)
+    DEV_URL_V2: ClassVar[str] = "https://channel.dev.captivat.io/api/channel/v2/sendMessage"
+    PROD_URL_V2: ClassVar[str] = "https://channel.prod.captivat.io/api/channel/v2/sendMessage"
     # Prevent session_id and hasLivechat from being changed once set
     _session_id_set = False
     _hasLivechat_set = False
@@ -317,39 +503,25 @@ class Captivate(BaseModel):
 
         return values
 
-    @model_validator(mode="after")
-    def set_response_metadata(self):
-        # Ensure the response is populated and update its metadata
+    def _sync_response(self) -> CaptivateResponseModel:
+        """
+        Returns the response model as a view over this instance: it is created on first
+        use and always points at the current session_id, hasLivechat and metadata.
+        Nothing is copied or compared at construction time.
+        """
         if self.response is None:
-            self.response = CaptivateResponseModel(
+            self.response = CaptivateResponseModel.model_construct(
+                response=[],
                 session_id=self.session_id,
                 metadata=self.metadata,
+                outgoing_action=None,
                 hasLivechat=self.hasLivechat,
             )
-
-        # Sync session_id and hasLivechat from Captivate to response
-        if self.session_id != self.response.session_id:
-            self.response.session_id = self.session_id
-        if self.hasLivechat != self.response.hasLivechat:
-            self.response.hasLivechat = self.hasLivechat
-
-        # Update metadata if it's been changed
-        if self.metadata != self.response.metadata:
-            self.response.metadata = self.metadata
-
-        return self
-
-    @model_validator(mode="after")
-    def copy_to_response(self):
-        """
-        Automatically copies session_id, hasLivechat, and metadata to the response if not explicitly set.
-        """
-        if self.response:
+        else:
             self.response.session_id = self.session_id
             self.response.hasLivechat = self.hasLivechat
             self.response.metadata = self.metadata
-
-        return self
+        return self.response
 
     def get_session_id(self) -> str:
         """
@@ -357,6 +529,24 @@ class Captivate(BaseModel):
         """
         return self.session_id
 
+    def get_idempotency_key(self, body: Optional[bytes] = None) -> str:
+        """
+        Returns the idempotency key of a response body: the session_id, a random token
+        fixed for this instance, a sequence number bumped by set_response and
+        set_outgoing_action, and a digest of the body. Resending an unchanged body
+        reuses the key; any change to it (messages, metadata, title, user) gives a new one.
+
+        Args:
+            body (bytes, optional): The serialized payload. Defaults to get_response_json().
+        """
+        if body is None:
+            body = self.get_response_json()
+        private = self.__pydantic_private__
+        if private["_idempotency_token"] is None:
+            private["_idempotency_token"] = secrets.token_hex(6)
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        return f"{self.session_id}:{private['_idempotency_token']}:{private['_response_seq']}:{digest}"
+
     def get_user_input(self) -> Optional[str]:
         """
         Returns the value of 'user_input'.
@@ -374,7 +564,8 @@ class Captivate(BaseModel):
     # Proxy method for custom object manipulation
     def set_metadata(self, key: str, value: Any):
         """Set a key-value pair in the custom metadata."""
-        self.metadata.internal.channelMetadata.set_custom(key, value)
+        with span(STAGE_METADATA, self.session_id, key=key):
+            self.metadata.internal.channelMetadata.set_custom(key, value)
 
     def get_metadata(self, key: str) -> Optional[Any]:
         """Retrieve the value for a given key in the custom metadata, including private if present."""
@@ -391,12 +582,22 @@ class Captivate(BaseModel):
     # Proxy method for private metadata manipulation
     def set_private_metadata(self, key: str, value: Any):
         """Set a key-value pair in the private custom metadata."""
-        self.metadata.internal.channelMetadata.set_private_metadata(key, value)
+        with span(STAGE_METADATA, self.session_id, key=key, private=True):
+            self.metadata.internal.channelMetadata.set_private_metadata(key, value)
 
     def get_private_metadata(self, key: str) -> Optional[Any]:
         """Retrieve the value for a given key in the private custom metadata."""
         return self.metadata.internal.channelMetadata.get_private_metadata(key)
 
+    # Proxy methods for metadata change tracking
+    def has_metadata_changes(self) -> bool:
+        """Check if any custom or private metadata key was set or removed since construction."""
+        return self.metadata.internal.channelMetadata.has_changes()
+
+    def get_metadata_changes(self) -> Dict[str, Dict[str, Any]]:
+        """Get the custom and private metadata keys set or removed since construction."""
+        return self.metadata.internal.channelMetadata.get_changes()
+
     # Proxy method for AgentsList manipulation
     def set_agents_list(self, agents_list: List[str]) -> None:
         """Set the AgentsList in custom metadata. This can only be set once."""
@@ -472,37 +673,42 @@ class Captivate(BaseModel):
     ) -> None:
         """
         Method to set the response messages in Captivate instance.
+        A ResponseBuilder is accepted too and built (checked once) here.
         """
-        # Ensure the response object exists
-        if not self.response:
-            self.response = CaptivateResponseModel(
-                session_id=self.session_id,
-                metadata=self.metadata,
-                hasLivechat=self.hasLivechat,
-            )
-
-        # Set the response_messages
-        self.response.response = response
+        if isinstance(response, ResponseBuilder):
+            response = response.build()
+        # Set the response_messages, creating the response view if needed
+        self._sync_response().response = response
+        self.__pydantic_private__["_response_seq"] += 1
 
     def get_incoming_action(self) -> Optional[List[ActionModel]]:
         """
         Retrieves the incoming actions from the response object, if present.
         """
-        if not self.response or self.incoming_action is None:
-            return None
         return self.incoming_action
 
+    async def dispatch_incoming_actions(
+        self,
+        dispatcher: Optional[ActionDispatcher] = None,
+        timeout: Optional[float] = None,
+    ) -> DispatchResult:
+        """
+        Runs the registered handler of every incoming action, concurrently except where
+        a handler declared a dependency, and reports per-handler results and latency.
+
+        Args:
+            dispatcher (ActionDispatcher, optional): Handler registry. Defaults to the shared dispatcher.
+            timeout (float, optional): Seconds allowed for all handlers together.
+        """
+        dispatcher = dispatcher if dispatcher is not None else get_default_dispatcher()
+        return await dispatcher.dispatch(self.incoming_action or [], self, timeout)
+
     def set_outgoing_action(self, actions: List[ActionModel]) -> None:
         """
         Sets the outgoing actions in the response object.
         """
-        if not self.response:
-            self.response = CaptivateResponseModel(
-                session_id=self.session_id,
-                metadata=self.metadata,
-                hasLivechat=self.hasLivechat,
-            )
-        self.response.outgoing_action = actions
+        self._sync_response().outgoing_action = actions
+        self.__pydantic_private__["_response_seq"] += 1
         
     @requires_router_mode
     def get_outgoing_action(self) -> Optional[List[ActionModel]]:
@@ -576,11 +782,32 @@ class Captivate(BaseModel):
         
     def get_response(self) -> Optional[str]:
         """
-        Returns the CaptivateResponseModel as a JSON string if it exists, otherwise returns None.
+        Returns the CaptivateResponseModel, built from the current state, as a dictionary.
         """
-        if self.response:
-            return self.response.model_dump()  # Convert the response to a JSON string
-        return None
+        with span(STAGE_SERIALIZE, self.session_id, format="dict"):
+            return self._sync_response().model_dump()  # Convert the response to a JSON string
+
+    def get_response_json(self, metadata_delta: bool = False) -> Optional[bytes]:
+        """
+        Returns the CaptivateResponseModel, built from the current state, as final JSON wire bytes.
+        The bytes can be passed to async_send_message(body=...) and returned with
+        CaptivateJSONResponse, so the reply is serialized only once.
+
+        Args:
+            metadata_delta (bool): Only include the custom/private metadata keys set or removed
+                since construction, and mark the payload with "metadataMode": "delta".
+        """
+        with span(STAGE_SERIALIZE, self.session_id, format="json", metadata_delta=metadata_delta) as stage:
+            response = self._sync_response()
+            if metadata_delta:
+                payload = response.model_dump(exclude={"metadata"})
+                payload["metadata"] = {"internal": {"channelMetadata": self.metadata.internal.channelMetadata.delta_dump()}}
+                payload["metadataMode"] = "delta"
+                body = dump_json_data(payload)
+            else:
+                body = dump_json(response)
+            stage.set(bytes=len(body), messages=len(response.response))
+            return body
     
     def get_files(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -614,25 +841,96 @@ class Captivate(BaseModel):
             data = {"session_id": "123", ...}
             captivate = Captivate.create(data)
         """
-        if isinstance(data, ChatRequest):
-            return cls(**data.model_dump())
-        elif isinstance(data, dict):
-            return cls(**data)
-        else:
-            raise ValueError(f"Unsupported data type: {type(data)}. Expected ChatRequest or dict.")
+        with span(STAGE_CREATE, source=type(data).__name__) as stage:
+            if isinstance(data, ChatRequest):
+                instance = cls.from_chat_request(data)
+            elif isinstance(data, dict):
+                instance = cls(**data)
+            else:
+                raise ValueError(f"Unsupported data type: {type(data)}. Expected ChatRequest or dict.")
+            stage.set(session_id=instance.session_id, files=len(instance.files or ()))
+            return instance
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, bytearray, str]) -> "Captivate":
+        """
+        Builds a Captivate instance straight from a raw JSON request body.
+
+        The body is decoded with json.loads and validated in a single pass, without
+        going through ChatRequest and validating metadata and incoming_action a second
+        time. Only the request fields are read: fields such as 'response' cannot be set
+        from the body.
+
+        Args:
+            data: The raw request body (bytes or str), shaped like ChatRequest.
+
+        Returns:
+            Captivate: A new Captivate instance
+
+        Raises:
+            json.JSONDecodeError: If the body is not valid JSON.
+            pydantic.ValidationError: If the body does not match the expected shape.
+
+        Example:
+            body = await request.body()
+            captivate = Captivate.from_json(body)
+        """
+        with span(STAGE_CREATE, source="json", bytes=len(data)) as stage:
+            body = _ChatRequestBody.model_validate(json.loads(data))
+            instance = cls.model_construct(
+                session_id=body.session_id,
+                user_input=body.user_input,
+                files=body.files,
+                metadata=body.metadata,
+                incoming_action=body.incoming_action,
+                hasLivechat=body.hasLivechat,
+            )
+            stage.set(session_id=instance.session_id, files=len(instance.files or ()))
+            return instance
+
+    @classmethod
+    def from_chat_request(cls, data: ChatRequest) -> "Captivate":
+        """
+        Builds a Captivate instance from an already-validated ChatRequest without
+        dumping it to a dict and validating everything a second time.
+
+        Fields that ChatRequest has already validated (session_id, user_input, files,
+        hasLivechat) are reused as-is; only metadata and incoming_action, which
+        ChatRequest keeps as plain dicts, are validated into their models. The files
+        list is shared with the ChatRequest rather than copied.
+
+        Args:
+            data (ChatRequest): A validated chat request, e.g. from a FastAPI route.
+
+        Returns:
+            Captivate: A new Captivate instance, equivalent to Captivate(**data.model_dump()).
+        """
+        instance = cls.model_construct(
+            session_id=data.session_id,
+            user_input=data.user_input,
+            files=data.files,
+            metadata=MetadataModel.model_validate(data.metadata),
+            incoming_action=(
+                [ActionModel.model_validate(action) for action in data.incoming_action]
+                if data.incoming_action is not None
+                else None
+            ),
+            hasLivechat=data.hasLivechat,
+        )
+        return instance
     
-    async def async_send_message_v1(self, environment: str = "dev") -> Dict[str, Any]: #DEPRECATED WILL NOT BE MAINTAINED
+    async def async_send_message_v1(self, environment: str = "dev", client: Optional[CaptivateClient] = None) -> Dict[str, Any]: #DEPRECATED WILL NOT BE MAINTAINED
         """
         Asynchronously sends the CaptivateResponseModel to the API endpoint based on the environment. DEP
 
         Args:
             environment (str): The environment to use ('dev' or 'prod'). Defaults to 'dev'.
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
 
         Returns:
             Dict[str, Any]: The response from the API.
         """
-        if not self.response:
-            raise ValueError("Response is not set. Cannot send an empty response.")
+        self._sync_response()
 
         # Determine the API URL based on the environment
         if environment == "prod":
@@ -679,60 +977,305 @@ class Captivate(BaseModel):
 
         
         print(payload)
-        # Perform the async POST request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(api_url, json=payload)
+        # Perform the async POST request over the pooled client
+        response = await _resolve_client(client).post(api_url, channel=channel, json=payload)
 
         # Raise an error if the request failed
         response.raise_for_status()
         return response
     
     
-    async def async_send_message(self, environment: str = "dev") -> Dict[str, Any]:
+    async def async_send_message(
+        self,
+        environment: str = "dev",
+        client: Optional[CaptivateClient] = None,
+        body: Optional[bytes] = None,
+        metadata_delta: bool = False,
+        idempotency_key: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
         Asynchronously sends the CaptivateResponseModel to the API endpoint based on the environment.
 
         Args:
             environment (str): The environment to use ('dev' or 'prod'). Defaults to 'dev'.
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
+            body (bytes, optional): Payload already produced by get_response_json(). Serialized here when omitted.
+            metadata_delta (bool): Opt-in wire mode that only sends the custom/private metadata keys
+                changed since construction (see get_response_json).
+            idempotency_key (str, optional): Sent as the Idempotency-Key header. Defaults to
+                get_idempotency_key() of the body; with a client dedupe table, a repeat of a delivered key
+                is not sent again.
+            max_bytes (int, optional): Payload size limit. A larger response is split into ordered parts
+                (see get_response_parts). Defaults to the client's max_body_bytes.
 
         Returns:
-        Dict[str, Any]: The response from the API.
+        Dict[str, Any]: The response from the API (of the last part, when split).
         """
-        if not self.response:
-            raise ValueError("Response is not set. Cannot send an empty response.")
-
         # Determine the API URL based on the environment
         api_url = self.PROD_URL_V2 if environment == "prod" else self.DEV_URL_V2
+        client = _resolve_client(client)
+        max_bytes = max_bytes if max_bytes is not None else client.max_body_bytes
+
+        # Serialize the response straight to JSON bytes, unless the caller already did
+        if body is not None:
+            bodies = [body]
+        elif max_bytes is not None:
+            bodies = self.get_response_parts(max_bytes, metadata_delta=metadata_delta)
+        else:
+            bodies = [self.get_response_json(metadata_delta=metadata_delta)]
 
-        # Convert the response to a dictionary
-        payload = self.response.model_dump()
+        # Send the request(s) over the pooled client, one part after the other to keep their order
+        for index, body in enumerate(bodies):
+            key = idempotency_key or self.get_idempotency_key(body)
+            if len(bodies) > 1:
+                key = f"{key}:part{index}"
+            with span(STAGE_SEND, self.session_id, url=api_url, bytes=len(body)) as stage:
+                response = await client.send_json(api_url, body, idempotency_key=key, channel=self.get_channel())
+                stage.set(status=response.status_code)
 
-        # Send the request
-        async with httpx.AsyncClient() as client:
-            response = await client.post(api_url, json=payload)
-
-        # Raise an error if the request failed
-        response.raise_for_status()
+                # Raise an error if the request failed
+                response.raise_for_status()
 
         return response.json()  # Return the response as a JSON dictionary
-    
-    async def download_file_to_memory(self, file_info: Dict[str, Any]) -> io.BytesIO:
+
+    def get_response_parts(self, max_bytes: int, metadata_delta: bool = False) -> List[bytes]:
+        """
+        Returns the response as sendMessage bodies of at most max_bytes each. A response
+        that fits is returned as a single body, equivalent to get_response_json(). Otherwise
+        the messages are split, in order, across parts that each carry the session and
+        metadata plus a "part": {"index", "total"} marker; outgoing actions go on the last
+        part only. Each message, the metadata and the actions are serialized once, and the
+        size of the single body is computed from those pieces.
+
+        Raises:
+            ResponseTooLargeError: If a single message cannot fit in max_bytes.
+        """
+        with span(STAGE_SERIALIZE, self.session_id, format="parts", metadata_delta=metadata_delta) as stage:
+            response = self._sync_response()
+            messages, separator = dump_json_joined(response.response)
+            if metadata_delta:
+                metadata = dump_json_data({"internal": {"channelMetadata": self.metadata.internal.channelMetadata.delta_dump()}})
+            else:
+                metadata = dump_json(response.metadata)
+            actions = response.outgoing_action
+            head = b'"session_id":' + dump_json_data(response.session_id) + b',"metadata":' + metadata
+            tail = b',"hasLivechat":' + dump_json_data(response.hasLivechat) + (b',"metadataMode":"delta"' if metadata_delta else b"")
+            last_actions = dump_json_data([action.model_dump() for action in actions] if actions is not None else None)
+            bodies = pack_parts(
+                messages,
+                separator,
+                len(response.response),
+                head + b',"outgoing_action":' + dump_json_data(None) + tail,
+                head + b',"outgoing_action":' + last_actions + tail,
+                max_bytes,
+            )
+            stage.set(bytes=sum(map(len, bodies)), messages=len(response.response), parts=len(bodies))
+            return bodies
+
+    async def enqueue_message(self, environment: str = "dev", sender: Optional[BackgroundSender] = None) -> asyncio.Future:
+        """
+        Queues the current response on a background sender and returns right away.
+        Replies queued for this session within the sender's coalescing window are
+        merged into one request, keeping their order.
+
+        Args:
+            environment (str): The environment to use ('dev' or 'prod'). Defaults to 'dev'.
+            sender (BackgroundSender, optional): Sender to queue on. Defaults to the shared sender.
+
+        Returns:
+            asyncio.Future: Resolves to the API response once delivered. Awaiting it is optional.
+        """
+        api_url = self.PROD_URL_V2 if environment == "prod" else self.DEV_URL_V2
+        sender = sender if sender is not None else get_default_sender()
+        payload = self.get_response()
+        body = dump_json_data(payload)  # Encoded once, for the idempotency key and the send
+        return await sender.enqueue(api_url, self.session_id, payload, self.get_idempotency_key(body), self.get_channel(), body=body)
+
+    def stream_text(
+        self,
+        environment: str = "dev",
+        client: Optional[CaptivateClient] = None,
+        min_chars: int = DEFAULT_STREAM_MIN_CHARS,
+        max_delay: float = DEFAULT_STREAM_MAX_DELAY,
+    ) -> TextStream:
+        """
+        Returns an async context manager that sends a text reply in parts while it is generated.
+
+        Args:
+            environment (str): The environment to use ('dev' or 'prod'). Defaults to 'dev'.
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
+            min_chars (int): Buffered characters that trigger a send.
+            max_delay (float): Seconds a chunk may wait in the buffer before it is sent anyway.
+
+        Example:
+            async with captivate.stream_text(environment="prod") as stream:
+                async for token in llm.stream(prompt):
+                    await stream.write(token)
+        """
+        return TextStream(self, environment, client, min_chars, max_delay)
+
+    def save_session(self, state: Optional[Dict[str, Any]] = None, store: Optional[SessionStore] = None) -> None:
+        """
+        Saves this session's metadata, plus any extra per-conversation state, as a binary snapshot.
+
+        Args:
+            state (Dict[str, Any], optional): Extra JSON-like state the agent wants back next turn.
+            store (SessionStore, optional): Store to use. Defaults to the library-wide store.
+        """
+        store = store if store is not None else get_session_store()
+        if store is None:
+            raise ValueError("No session store configured. Pass store= or call set_session_store().")
+        store.set(self.session_id, self.metadata.model_dump(), state)
+
+    def restore_session(self, store: Optional[SessionStore] = None, restore_metadata: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Loads the snapshot saved for this session_id.
+
+        Args:
+            store (SessionStore, optional): Store to use. Defaults to the library-wide store.
+            restore_metadata (bool): Replace the current metadata with the saved one.
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved extra state, or None if nothing (unexpired) was saved.
+        """
+        store = store if store is not None else get_session_store()
+        if store is None:
+            raise ValueError("No session store configured. Pass store= or call set_session_store().")
+        snapshot = store.get(self.session_id)
+        if snapshot is None:
+            return None
+        if restore_metadata:
+            self.metadata = MetadataModel.model_validate(snapshot.metadata)
+        return snapshot.state
+
+    async def download_file_to_memory(
+        self,
+        file_info: Dict[str, Any],
+        client: Optional[CaptivateClient] = None,
+        stream: bool = False,
+        max_bytes: Optional[int] = None,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+        cache: Optional[AttachmentCache] = None,
+    ) -> BinaryIO:
         """
         Downloads a file from the given dictionary and stores it in memory.
 
+        The body is read in chunks, so memory use stays at about the size of the file.
+        With stream=True the chunks go into a SpooledTemporaryFile that moves to disk
+        once it grows past spool_threshold bytes.
+
         Args:
             file_info (Dict[str, Any]): Dictionary containing the file details.
-                Expected keys: 'url' (str), 'type' (str), 'filename' (str).
+                Expected keys: 'url' (str) or 'storage.presignedUrl' (str), 'type' (str), 'filename' (str).
+                'storage.fileSize' (int), when present, is checked against max_bytes before downloading.
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
+            stream (bool): Spool to a temporary file past spool_threshold instead of keeping everything in memory.
+            max_bytes (int, optional): Abort the download with FileTooLargeError once the file exceeds this size.
+            spool_threshold (int): Bytes kept in memory before spilling to disk when stream=True.
+            cache (AttachmentCache, optional): Cache to read from and fill. Defaults to the cache set with
+                set_attachment_cache(), if any. Cache hits are returned as io.BytesIO.
 
         Returns:
-            io.BytesIO: In-memory file stream.
+            io.BytesIO (or a SpooledTemporaryFile when stream=True): File stream positioned at the start.
         """
-        if "url" not in file_info:
-            raise ValueError("Missing 'url' key in file_info dictionary.")
+        with span(STAGE_DOWNLOAD, self.session_id, filename=file_info.get("filename")) as stage:
+            cache = cache if cache is not None else get_attachment_cache()
+            if cache is not None:
+                cached = cache.get(file_info)
+                if cached is not None and (max_bytes is None or len(cached) <= max_bytes):
+                    stage.set(bytes=len(cached), cached=True)
+                    return io.BytesIO(cached)
+
+            buffer = spooled_buffer(spool_threshold) if stream else io.BytesIO()
+            try:
+                await download_to_buffer(_resolve_client(client), file_info, buffer, max_bytes=max_bytes)
+            except BaseException:
+                buffer.close()
+                raise
+
+            size = buffer.seek(0, io.SEEK_END)
+            buffer.seek(0)
+            stage.set(bytes=size, cached=False)
+            if cache is not None and size <= cache.max_bytes:
+                cache.set(file_info, buffer.getvalue() if isinstance(buffer, io.BytesIO) else buffer.read())
+                buffer.seek(0)
+            return buffer
+
+    async def download_files(
+        self,
+        files: Optional[List[Dict[str, Any]]] = None,
+        max_concurrency: int = 4,
+        stream: bool = False,
+        max_bytes: Optional[int] = None,
+        client: Optional[CaptivateClient] = None,
+    ) -> List[FileDownloadResult]:
+        """
+        Downloads several files concurrently over the shared connection pool.
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(file_info["url"])
-            response.raise_for_status()  # Raise an error for failed requests
+        A failed download does not cancel the others; each file gets a FileDownloadResult
+        with either its stream or the error that occurred.
 
-        return io.BytesIO(response.content)  # Store the file in-memory
+        Args:
+            files (List[Dict[str, Any]], optional): File dicts to download. Defaults to the files of this request.
+            max_concurrency (int): Maximum number of downloads in flight at once.
+            stream (bool): Spool large files to disk (see download_file_to_memory).
+            max_bytes (int, optional): Per-file size limit (see download_file_to_memory).
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
 
+        Returns:
+            List[FileDownloadResult]: One result per file, in the original order, with per-file timings.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if files is None:
+            files = self.files or []
+
+        client = _resolve_client(client)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def download_one(index: int, file_info: Dict[str, Any]) -> FileDownloadResult:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    data = await self.download_file_to_memory(file_info, client=client, stream=stream, max_bytes=max_bytes)
+                except Exception as e:
+                    return FileDownloadResult(
+                        index=index,
+                        filename=file_info.get("filename"),
+                        ok=False,
+                        error=f"{type(e).__name__}: {e}",
+                        exception=e,
+                        elapsed=time.perf_counter() - started,
+                    )
+                return FileDownloadResult(
+                    index=index,
+                    filename=file_info.get("filename"),
+                    ok=True,
+                    data=data,
+                    elapsed=time.perf_counter() - started,
+                )
+
+        return list(await asyncio.gather(*(download_one(i, f) for i, f in enumerate(files))))
+
+    async def iter_file_chunks(
+        self,
+        file_info: Dict[str, Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bytes: Optional[int] = None,
+        client: Optional[CaptivateClient] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams a file from the given dictionary chunk by chunk, for callers that can consume a stream.
+
+        Args:
+            file_info (Dict[str, Any]): Dictionary containing the file details (see download_file_to_memory).
+            chunk_size (int): Maximum number of bytes per chunk.
+            max_bytes (int, optional): Abort with FileTooLargeError once the file exceeds this size.
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
+
+        Yields:
+            bytes: The next chunk of the file.
+        """
+        async for chunk in iter_file_chunks(_resolve_client(client), file_info, chunk_size, max_bytes):
+            yield chunk
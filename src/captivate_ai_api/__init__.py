@@ -1 +1,17 @@
-from .Captivate import ActionModel, Captivate, CardMessageModel, FileModel, HtmlMessageModel, TableMessageModel, TextMessageModel, ButtonMessageModel, ChatRequest, CaptivateResponseModel
\ No newline at end of file
+from .Captivate import ActionModel, Captivate, CardMessageModel, FileModel, HtmlMessageModel, TableMessageModel, TextMessageModel, ButtonMessageModel, ChatRequest, CaptivateResponseModel, apply_metadata_delta
+from .client import CaptivateClient, get_default_client, set_default_client, close_default_client
+from .batch import send_many, SendResult, BatchSendResult
+from .files import FileTooLargeError, FileDownloadResult
+from .cache import AttachmentCache, MemoryAttachmentCache, DiskAttachmentCache, get_attachment_cache, set_attachment_cache
+from .serialization import set_json_encoder, get_json_encoder
+from .instrumentation import StageEvent, HistogramCollector, add_stage_listener, remove_stage_listener, span
+from .resilience import RetryPolicy, HedgePolicy, CircuitBreaker, CircuitOpenError
+from .idempotency import DedupeTable
+from .sender import BackgroundSender, get_default_sender, set_default_sender
+from .ratelimit import RateLimiter, TokenBucket
+from .stream import TextStream
+from .session import SessionStore, MemorySessionStore, SQLiteSessionStore, get_session_store, set_session_store
+from .builders import ResponseBuilder, Text, Card, Cards, Buttons, Html, Table
+from .columnar import render_table, iter_table_html, table_message, cards_message
+from .parts import ResponseTooLargeError
+from .dispatch import ActionDispatcher, ActionResult, DispatchResult, get_default_dispatcher, set_default_dispatcher
\ No newline at end of file
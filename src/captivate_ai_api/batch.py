@@ -0,0 +1,92 @@
+import asyncio
+import time
+from typing import Optional, Any, List, Sequence, TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from .client import CaptivateClient, _resolve_client
+
+if TYPE_CHECKING:
+    from .Captivate import Captivate
+
+
+class SendResult(BaseModel):
+    index: int  # Position of the instance in the input sequence
+    session_id: str
+    ok: bool
+    response: Optional[Any] = None  # API response on success
+    error: Optional[str] = None  # Error message on failure
+    exception: Optional[Any] = None  # Original exception on failure
+    elapsed: float = 0.0  # Seconds spent sending this item
+
+
+class BatchSendResult(BaseModel):
+    results: List[SendResult] = []  # One result per instance, in input order
+    elapsed: float = 0.0  # Wall-clock seconds for the whole batch
+
+    @property
+    def succeeded(self) -> List[SendResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> List[SendResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def throughput(self) -> float:
+        """Messages sent per second over the whole batch."""
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+
+async def send_many(
+    instances: Sequence["Captivate"],
+    environment: str = "dev",
+    max_concurrency: int = 10,
+    client: Optional[CaptivateClient] = None,
+) -> BatchSendResult:
+    """
+    Sends the responses of many Captivate instances concurrently over a shared pool.
+
+    A failing send does not cancel the others: every instance gets a SendResult
+    with either the API response or the error that occurred.
+
+    Args:
+        instances (Sequence[Captivate]): Instances whose responses should be sent.
+        environment (str): The environment to use ('dev' or 'prod'). Defaults to 'dev'.
+        max_concurrency (int): Maximum number of requests in flight at once.
+        client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
+
+    Returns:
+        BatchSendResult: Per-item results in input order, plus total elapsed time and throughput.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+
+    client = _resolve_client(client)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def send_one(index: int, instance: "Captivate") -> SendResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await instance.async_send_message(environment, client=client)
+            except Exception as e:
+                return SendResult(
+                    index=index,
+                    session_id=instance.session_id,
+                    ok=False,
+                    error=f"{type(e).__name__}: {e}",
+                    exception=e,
+                    elapsed=time.perf_counter() - started,
+                )
+            return SendResult(
+                index=index,
+                session_id=instance.session_id,
+                ok=True,
+                response=response,
+                elapsed=time.perf_counter() - started,
+            )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(send_one(i, instance) for i, instance in enumerate(instances)))
+    return BatchSendResult(results=list(results), elapsed=time.perf_counter() - started)
@@ -0,0 +1,181 @@
+from typing import Dict, Any, List, Iterable, Mapping, Optional, Union
+
+
+class Text:
+    """Plain text message record. Same wire format as TextMessageModel."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class Card:
+    """One card of a carousel. Same wire format as CardMessageModel."""
+
+    __slots__ = ("text", "description", "image_url", "link")
+
+    def __init__(self, text: str, description: str, image_url: str, link: str):
+        self.text = text
+        self.description = description
+        self.image_url = image_url
+        self.link = link
+
+
+class Cards:
+    """Card carousel record, sent as a 'cards' message. Cards may be Card records, tuples, lists or dicts."""
+
+    __slots__ = ("cards",)
+
+    def __init__(self, cards: List["CardLike"]):
+        self.cards = cards
+
+
+class Buttons:
+    """Button message record. Same wire format as ButtonMessageModel."""
+
+    __slots__ = ("title", "options")
+
+    def __init__(self, title: str, options: List[Dict[str, Any]]):
+        self.title = title
+        self.options = options  # e.g. [{"label": "Yes", "value": "yes"}]
+
+
+class Html:
+    __slots__ = ("html",)
+
+    def __init__(self, html: str):
+        self.html = html
+
+
+class Table:
+    __slots__ = ("table",)
+
+    def __init__(self, table: str):
+        self.table = table
+
+
+Record = Union[Text, Cards, Buttons, Html, Table]
+CardLike = Union[Card, tuple, list, Mapping[str, Any]]
+
+_CARD_FIELDS = Card.__slots__
+
+
+def _card_fields(card: CardLike) -> Optional[tuple]:
+    """(text, description, image_url, link) of a Card, tuple, list or mapping; None for anything else."""
+    if type(card) is tuple:
+        return card
+    if isinstance(card, Mapping):
+        return card.get("text"), card.get("description"), card.get("image_url"), card.get("link")
+    if isinstance(card, Card):
+        return card.text, card.description, card.image_url, card.link
+    if isinstance(card, (tuple, list)):
+        return tuple(card)
+    return None
+
+
+class ResponseBuilder:
+    """
+    Collects response messages as plain __slots__ records, without validating
+    each one, and turns the whole batch into wire dicts in one pass in build().
+    The output is what set_response() would send for the equivalent
+    TextMessageModel / CardMessageModel / ButtonMessageModel objects.
+
+    Example:
+        builder = ResponseBuilder()
+        builder.text("Here are our offers:")
+        builder.cards((offer.title, offer.summary, offer.image, offer.url) for offer in offers)
+        builder.buttons("Anything else?", [{"label": "No", "value": "no"}])
+        captivate.set_response(builder.build())
+    """
+
+    __slots__ = ("records",)
+
+    def __init__(self):
+        self.records: List[Record] = []
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def text(self, text: str) -> "ResponseBuilder":
+        self.records.append(Text(text))
+        return self
+
+    def cards(self, cards: Iterable[CardLike]) -> "ResponseBuilder":
+        """Adds a carousel. Each card is a Card, a (text, description, image_url, link) tuple or list, or a dict."""
+        self.records.append(Cards(list(cards)))
+        return self
+
+    def buttons(self, title: str, options: List[Dict[str, Any]]) -> "ResponseBuilder":
+        self.records.append(Buttons(title, options))
+        return self
+
+    def html(self, html: str) -> "ResponseBuilder":
+        self.records.append(Html(html))
+        return self
+
+    def table(self, table: str) -> "ResponseBuilder":
+        self.records.append(Table(table))
+        return self
+
+    def add(self, record: Record) -> "ResponseBuilder":
+        self.records.append(record)
+        return self
+
+    def build(self) -> List[Dict[str, Any]]:
+        """
+        Checks every record and returns the messages as wire dicts.
+
+        Raises:
+            ValueError: Listing every invalid field, e.g. "message 3, card 7: 'link' must be a string".
+        """
+        errors: List[str] = []
+        messages: List[Dict[str, Any]] = []
+        append = messages.append
+        for index, record in enumerate(self.records):
+            cls = type(record)
+            if cls is Text:
+                if type(record.text) is not str:
+                    errors.append(f"message {index}: 'text' must be a string")
+                append({"type": "text", "text": record.text})
+            elif cls is Cards:
+                cards = []
+                for card_index, card in enumerate(record.cards):
+                    fields = _card_fields(card)
+                    if fields is None:
+                        errors.append(
+                            f"message {index}, card {card_index}: expected a Card, a 4-tuple or a dict, got {type(card).__name__}"
+                        )
+                        continue
+                    if len(fields) != 4:
+                        errors.append(f"message {index}, card {card_index}: expected 4 fields, got {len(fields)}")
+                        continue
+                    text, description, image_url, link = fields
+                    if not (type(text) is str and type(description) is str and type(image_url) is str and type(link) is str):
+                        errors.extend(
+                            f"message {index}, card {card_index}: '{field}' must be a string"
+                            for field, value in zip(_CARD_FIELDS, fields)
+                            if not isinstance(value, str)
+                        )
+                    cards.append({"text": text, "description": description, "image_url": image_url, "link": link})
+                append({"type": "cards", "cards": cards})
+            elif cls is Buttons:
+                if not isinstance(record.title, str):
+                    errors.append(f"message {index}: button 'title' must be a string")
+                if not isinstance(record.options, list):
+                    errors.append(f"message {index}: button 'options' must be a list")
+                append({"type": "button", "buttons": {"title": record.title, "options": record.options}})
+            elif cls is Html:
+                if not isinstance(record.html, str):
+                    errors.append(f"message {index}: 'html' must be a string")
+                append({"type": "html", "html": record.html})
+            elif cls is Table:
+                if not isinstance(record.table, str):
+                    errors.append(f"message {index}: 'table' must be a string")
+                append({"type": "table", "table": record.table})
+            else:
+                errors.append(f"message {index}: unsupported record type {cls.__name__}")
+        if errors:
+            shown = "; ".join(errors[:10]) + (f"; and {len(errors) - 10} more" if len(errors) > 10 else "")
+            raise ValueError(f"Invalid response messages: {shown}")
+        return messages
@@ -0,0 +1,256 @@
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# 'storage.expiresIn' values above this are absolute Unix timestamps, below it relative seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
+# Query parameters of presigned URLs (S3, CloudFront, GCS) that change between requests
+# for the same file; left out of the cache key
+_SIGNATURE_PARAMS = frozenset({"signature", "expires", "awsaccesskeyid", "key-pair-id", "policy", "googleaccessid"})
+_SIGNATURE_PREFIXES = ("x-amz-", "x-goog-")
+# Azure SAS parameters, only stripped when the URL carries a SAS signature ('sig')
+_SAS_PARAMS = frozenset({"sig", "se", "st", "sp", "sv", "sr", "spr", "ss", "srt", "si", "skoid", "sktid", "skt", "ske", "sks", "skv"})
+
+
+def _strip_signature(query: str) -> str:
+    params = parse_qsl(query, keep_blank_values=True)
+    sas = any(name.lower() == "sig" for name, _ in params)
+    return urlencode([
+        (name, value)
+        for name, value in params
+        if not (
+            name.lower() in _SIGNATURE_PARAMS
+            or name.lower().startswith(_SIGNATURE_PREFIXES)
+            or (sas and name.lower() in _SAS_PARAMS)
+        )
+    ])
+
+
+def attachment_cache_key(file_info: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns the cache key of a file dict: 'storage.fileKey' if present, otherwise a
+    SHA-256 of the download URL without its presigned-signature query parameters
+    (presigned URLs change their signature on every request, while the other
+    parameters, e.g. ?id=..., may identify the file).
+    """
+    storage = file_info.get("storage") or {}
+    if storage.get("fileKey"):
+        return str(storage["fileKey"])
+    url = file_info.get("url") or storage.get("presignedUrl")
+    if not url:
+        return None
+    parts = urlsplit(url)
+    query = _strip_signature(parts.query)
+    identity = f"{parts.scheme}://{parts.netloc}{parts.path}" + (f"?{query}" if query else "")
+    return "sha256:" + hashlib.sha256(identity.encode()).hexdigest()
+
+
+def attachment_expires_at(file_info: Dict[str, Any], ttl: Optional[float] = None) -> Optional[float]:
+    """
+    Returns the Unix time after which a cached copy of the file must not be used:
+    the earlier of 'storage.expiresIn' and now + ttl.
+    """
+    now = time.time()
+    candidates = []
+    expires_in = (file_info.get("storage") or {}).get("expiresIn")
+    if isinstance(expires_in, (int, float)) and not isinstance(expires_in, bool):
+        candidates.append(float(expires_in) if expires_in >= _EPOCH_THRESHOLD else now + expires_in)
+    if ttl is not None:
+        candidates.append(now + ttl)
+    return min(candidates) if candidates else None
+
+
+class AttachmentCache(ABC):
+    """
+    Base class for attachment caches. Subclasses implement `_load`, `_store`,
+    `_discard` and `clear`; hit and miss counting and expiry checks live here.
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None):
+        """
+        Args:
+            max_bytes (int): Total size of cached file contents. Least recently used entries are evicted beyond it.
+            ttl (float, optional): Maximum seconds an entry is kept, in addition to 'storage.expiresIn'.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        ...
+
+    @abstractmethod
+    def _store(self, key: str, data: bytes, expires_at: Optional[float]) -> None:
+        ...
+
+    @abstractmethod
+    def _discard(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def get(self, file_info: Dict[str, Any]) -> Optional[bytes]:
+        """Returns the cached contents of a file dict, or None on a miss."""
+        key = attachment_cache_key(file_info)
+        entry = self._load(key) if key is not None else None
+        if entry is not None:
+            data, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                self.hits += 1
+                return data
+            self._discard(key)
+        self.misses += 1
+        return None
+
+    def set(self, file_info: Dict[str, Any], data: bytes) -> bool:
+        """Caches the contents of a file dict. Returns False if it cannot be cached."""
+        key = attachment_cache_key(file_info)
+        expires_at = attachment_expires_at(file_info, self.ttl)
+        if key is None or len(data) > self.max_bytes or (expires_at is not None and expires_at <= time.time()):
+            return False
+        self._store(key, data, expires_at)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class MemoryAttachmentCache(AttachmentCache):
+    """In-process LRU cache bounded by the total size of the cached files."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = None):
+        super().__init__(max_bytes, ttl)
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        self.size = 0  # Bytes currently cached
+
+    def _load(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, data: bytes, expires_at: Optional[float]) -> None:
+        self._discard(key)
+        self._entries[key] = (data, expires_at)
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+class DiskAttachmentCache(AttachmentCache):
+    """
+    Cache stored as files in a local directory, so several worker processes on
+    the same host can share it. Writes are atomic (write to a temporary file,
+    then rename); recency is tracked with the file modification time.
+    """
+
+    _HEADER = struct.Struct("<d")  # Expiry timestamp, 0 when the entry never expires
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, ttl: Optional[float] = None):
+        super().__init__(max_bytes, ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _load(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        if len(raw) < self._HEADER.size:
+            return None
+        (expires_at,) = self._HEADER.unpack_from(raw)
+        return raw[self._HEADER.size:], expires_at or None
+
+    def _store(self, key: str, data: bytes, expires_at: Optional[float]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._HEADER.pack(expires_at or 0.0))
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._evict()
+
+    def _discard(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # Removed by another worker
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.directory):
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+_default_cache: Optional[AttachmentCache] = None
+
+
+def get_attachment_cache() -> Optional[AttachmentCache]:
+    """Returns the library-wide attachment cache, or None when caching is disabled (the default)."""
+    return _default_cache
+
+
+def set_attachment_cache(cache: Optional[AttachmentCache]) -> None:
+    """Enables (or, with None, disables) the library-wide attachment cache used by file downloads."""
+    global _default_cache
+    _default_cache = cache
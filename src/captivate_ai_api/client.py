@@ -0,0 +1,241 @@
+import asyncio
+import weakref
+from typing import Optional, Dict, Any, Awaitable
+
+import httpx
+
+from .compression import DEFAULT_COMPRESSION_THRESHOLD, CompressionStats, check_encoding, maybe_compress
+from .idempotency import IDEMPOTENCY_HEADER, DedupeTable
+from .ratelimit import RateLimiter
+from .resilience import RetryPolicy, HedgePolicy, CircuitBreaker, send_with_resilience
+from .serialization import JSON_CONTENT_TYPE
+
+# Connection pool defaults, sized for a single worker talking to the channel API
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 5.0  # Same as httpx's default
+
+
+class CaptivateClient:
+    """
+    Long-lived, pooled HTTP client used by every outbound call in the library.
+
+    Connections to the channel API (and to file storage) are kept alive and
+    reused between calls instead of paying a new TCP/TLS handshake per request.
+    The underlying httpx.AsyncClient is created lazily on first use, or
+    explicitly with `start()`, and released with `aclose()`.
+
+    Example (FastAPI lifespan):
+        client = CaptivateClient(max_connections=50)
+
+        @asynccontextmanager
+        async def lifespan(app):
+            await client.start()
+            set_default_client(client)
+            yield
+            await client.aclose()
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool = False,
+        timeout: Any = DEFAULT_TIMEOUT,
+        compression: Optional[str] = None,
+        compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+        compression_level: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        dedupe: Optional[DedupeTable] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_body_bytes: Optional[int] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Args:
+            max_connections (int, optional): Maximum number of concurrent connections.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept in the pool.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept before being closed.
+            http2 (bool): Enable HTTP/2. Requires the optional 'h2' package (pip install captivate-ai-api[http2]).
+            timeout: Timeout passed to httpx (float seconds or httpx.Timeout).
+            compression (str, optional): Compress outgoing message bodies with 'gzip' or 'zstd'
+                (zstd requires the optional 'zstandard' package). Disabled by default.
+            compression_threshold (int): Bodies smaller than this many bytes are sent uncompressed.
+            compression_level (int, optional): Compression level; defaults to 6 for gzip and 3 for zstd.
+            retry (RetryPolicy, optional): Retry failed message sends (transport errors, 429 and 5xx)
+                with jittered exponential backoff. Disabled by default.
+            hedge (HedgePolicy, optional): Send a duplicate request when a message send is slower
+                than a latency percentile of the endpoint; the first response wins. Disabled by default.
+            circuit_breaker (CircuitBreaker, optional): Fail fast with CircuitOpenError while an
+                endpoint keeps failing. Disabled by default.
+            dedupe (DedupeTable, optional): Drop repeated sends of an idempotency key that was
+                already delivered within the table's window. Disabled by default.
+            rate_limiter (RateLimiter, optional): Token buckets every POST waits on before it is sent
+                (including retries and hedges). Disabled by default.
+            max_body_bytes (int, optional): Default payload size limit for async_send_message;
+                larger responses are split into ordered parts. Disabled by default.
+            **client_kwargs: Extra keyword arguments forwarded to httpx.AsyncClient (e.g. transport, headers).
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        check_encoding(compression)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self.compression_stats = CompressionStats()
+        self.retry = retry
+        self.hedge = hedge
+        self.circuit_breaker = circuit_breaker
+        self.dedupe = dedupe
+        self.rate_limiter = rate_limiter
+        self.max_body_bytes = max_body_bytes
+        self._client_kwargs = client_kwargs
+        # One pool per event loop: connections are bound to the loop that opened them
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    def _build(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=self.limits,
+            http2=self.http2,
+            timeout=self.timeout,
+            **self._client_kwargs,
+        )
+
+    def _drop_closed_loops(self) -> None:
+        # Clients of a closed loop can neither be used nor closed any more; let them go
+        for loop in [loop for loop in self._clients if loop.is_closed()]:
+            del self._clients[loop]
+
+    @property
+    def is_started(self) -> bool:
+        return any(not client.is_closed for client in self._clients.values())
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """
+        Returns the underlying httpx.AsyncClient of the running event loop, creating
+        it if needed. Each event loop gets its own pool (e.g. successive asyncio.run()
+        calls in a script), since connections cannot be shared across loops.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            self._drop_closed_loops()
+            client = self._clients[loop] = self._build()
+        return client
+
+    async def start(self) -> "CaptivateClient":
+        """Open the connection pool of the running loop. Calling it more than once is a no-op."""
+        self.http  # Creates the underlying client if needed
+        return self
+
+    async def aclose(self) -> None:
+        """Close the connection pool of the running loop. The client can be started again afterwards."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        self._drop_closed_loops()
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    async def __aenter__(self) -> "CaptivateClient":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def post(self, url: str, channel: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(url, channel)
+        return await self.http.post(url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.http.get(url, **kwargs)
+
+    async def send_json(
+        self,
+        url: str,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        idempotency_key: Optional[str] = None,
+        channel: Optional[str] = None,
+    ) -> httpx.Response:
+        """
+        POSTs an already-serialized JSON body, so it is not encoded a second time.
+        The body is compressed (with a matching Content-Encoding header) when the
+        client has compression enabled and the body reaches the threshold.
+        Retries, hedging and the circuit breaker apply when configured; every
+        attempt carries the same Idempotency-Key header.
+
+        Args:
+            url (str): Endpoint to post to.
+            body (bytes): JSON payload, e.g. from Captivate.get_response_json().
+            headers (Dict[str, str], optional): Extra request headers.
+            idempotency_key (str, optional): Sent as the Idempotency-Key header and used by the dedupe table.
+            channel (str, optional): Channel of the conversation, for per-channel rate limits.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open for url.
+        """
+        request_headers = {"Content-Type": JSON_CONTENT_TYPE}
+        body, encoding = maybe_compress(
+            body, self.compression, self.compression_threshold, self.compression_level, self.compression_stats
+        )
+        if encoding is not None:
+            request_headers["Content-Encoding"] = encoding
+        if idempotency_key is not None:
+            request_headers[IDEMPOTENCY_HEADER] = idempotency_key
+        if headers:
+            request_headers.update(headers)
+
+        def post() -> Awaitable[httpx.Response]:
+            return self.post(url, channel=channel, content=body, headers=request_headers)
+
+        async def send() -> httpx.Response:
+            if self.retry is None and self.hedge is None and self.circuit_breaker is None:
+                return await post()
+            return await send_with_resilience(
+                post,
+                url,
+                retry=self.retry,
+                hedge=self.hedge,
+                breaker=self.circuit_breaker,
+            )
+
+        if self.dedupe is not None and idempotency_key is not None:
+            return await self.dedupe.send_once(idempotency_key, send)
+        return await send()
+
+
+_default_client: Optional[CaptivateClient] = None
+
+
+def get_default_client() -> CaptivateClient:
+    """Returns the library-wide shared client, creating it on first use."""
+    global _default_client
+    if _default_client is None:
+        _default_client = CaptivateClient()
+    return _default_client
+
+
+def set_default_client(client: Optional[CaptivateClient]) -> None:
+    """Replaces the library-wide shared client (None resets it to the defaults)."""
+    global _default_client
+    _default_client = client
+
+
+async def close_default_client() -> None:
+    """Closes the library-wide shared client, e.g. on application shutdown."""
+    if _default_client is not None:
+        await _default_client.aclose()
+
+
+def _resolve_client(client: Optional[CaptivateClient]) -> CaptivateClient:
+    return client if client is not None else get_default_client()
@@ -0,0 +1,159 @@
+from html import escape
+from itertools import islice
+from typing import Optional, Dict, Any, List, Sequence, Iterator, Union, Mapping
+
+Columns = Mapping[str, Sequence[Any]]  # Header -> column values
+Records = Sequence[Union[Mapping[str, Any], Sequence[Any]]]  # Row dicts or row tuples
+
+DEFAULT_CHUNK_ROWS = 1000  # Rows rendered per chunk when streaming
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else escape(value if type(value) is str else str(value))
+
+
+def _escape_column(values: Sequence[Any]) -> List[str]:
+    """
+    Escapes a whole column with one escape() call: the cells are joined with NUL,
+    escaped together and split again. Falls back to per-cell escaping if a cell
+    itself contains NUL.
+    """
+    cells = ["" if value is None else value if type(value) is str else str(value) for value in values]
+    joined = "\x00".join(cells)
+    if joined.count("\x00") != len(cells) - 1:
+        return [escape(cell) for cell in cells]
+    return escape(joined).split("\x00") if cells else []
+
+
+def _to_columns(
+    columns: Optional[Columns],
+    records: Optional[Records],
+    headers: Optional[Sequence[str]],
+    max_rows: Optional[int] = None,
+):
+    """
+    Normalizes either input shape to (headers, list of columns, total rows). Records
+    are cut to max_rows before being transposed; columns are sliced when rendered.
+    """
+    if (columns is None) == (records is None):
+        raise ValueError("Pass exactly one of 'columns' or 'records'.")
+    if columns is not None:
+        headers = list(headers) if headers is not None else list(columns)
+        data = [columns[header] for header in headers]
+        lengths = {len(column) for column in data}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got lengths {sorted(lengths)}.")
+        return headers, data, lengths.pop() if lengths else 0
+
+    total = len(records)
+    shown = records if max_rows is None or max_rows >= total else records[:max_rows]
+    if records and isinstance(records[0], Mapping):
+        headers = list(headers) if headers is not None else list(records[0])
+        data = [[record.get(header) for record in shown] for header in headers]
+    else:
+        widths = {len(record) for record in records}
+        if len(widths) > 1:
+            raise ValueError(f"All rows must have the same length, got lengths {sorted(widths)}.")
+        width = widths.pop() if widths else len(headers or ())
+        headers = list(headers) if headers is not None else []
+        if headers and len(headers) != width:
+            raise ValueError(f"Got {len(headers)} headers for rows of {width} values.")
+        data = [list(column) for column in zip(*shown)] if shown else [[] for _ in range(width)]
+    return headers, data, total
+
+
+def iter_table_html(
+    columns: Optional[Columns] = None,
+    records: Optional[Records] = None,
+    headers: Optional[Sequence[str]] = None,
+    max_rows: Optional[int] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    truncation_note: str = "{remaining} more rows not shown",
+) -> Iterator[str]:
+    """
+    Renders an HTML table from columnar input, yielding it in chunks of
+    chunk_rows rows so very large tables never need one giant string.
+    Every cell is HTML-escaped; None renders as an empty cell.
+
+    Args:
+        columns (Mapping[str, Sequence]): Column values by header, e.g. {"Name": [...], "Total": [...]}.
+        records (Sequence[Mapping | Sequence]): Alternatively, rows as dicts or tuples.
+        headers (Sequence[str], optional): Header order (and selection). Defaults to the column or record keys.
+        max_rows (int, optional): Rows rendered at most; a final row with truncation_note says how many were left out.
+        chunk_rows (int): Rows per yielded chunk.
+        truncation_note (str): Text of the truncation row; '{remaining}' is replaced by the number of rows left out.
+
+    Raises:
+        ValueError: If both or neither of columns and records are given, or the columns (or rows) differ in length.
+    """
+    headers, data, total = _to_columns(columns, records, headers, max_rows)
+    shown = total if max_rows is None else min(total, max_rows)
+
+    head = "".join(f"<th>{_cell(header)}</th>" for header in headers)
+    yield f"<table><thead><tr>{head}</tr></thead><tbody>" if headers else "<table><tbody>"
+
+    # Escape column by column, then zip the escaped columns into rows
+    for start in range(0, shown, chunk_rows):
+        stop = min(start + chunk_rows, shown)
+        escaped = [_escape_column(column[start:stop]) for column in data]
+        rows = map("</td><td>".join, zip(*escaped))
+        yield "<tr><td>" + "</td></tr><tr><td>".join(rows) + "</td></tr>"
+
+    if shown < total:
+        note = escape(truncation_note.format(remaining=total - shown))
+        yield f'<tr><td colspan="{max(1, len(data))}">{note}</td></tr>'
+    yield "</tbody></table>"
+
+
+def render_table(
+    columns: Optional[Columns] = None,
+    records: Optional[Records] = None,
+    headers: Optional[Sequence[str]] = None,
+    max_rows: Optional[int] = None,
+    truncation_note: str = "{remaining} more rows not shown",
+) -> str:
+    """Renders a whole escaped HTML table in one string. See iter_table_html for the arguments."""
+    return "".join(iter_table_html(columns, records, headers, max_rows, DEFAULT_CHUNK_ROWS, truncation_note))
+
+
+def table_message(
+    columns: Optional[Columns] = None,
+    records: Optional[Records] = None,
+    headers: Optional[Sequence[str]] = None,
+    max_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Returns a 'table' message in the TableMessageModel wire format, ready for set_response()."""
+    return {"type": "table", "table": render_table(columns, records, headers, max_rows)}
+
+
+def cards_message(
+    text: Sequence[str],
+    description: Sequence[str],
+    image_url: Sequence[str],
+    link: Sequence[str],
+    max_cards: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Returns a 'cards' message in the CardCollectionModel wire format from one
+    sequence per card field, checked in one pass per column instead of
+    validating a CardMessageModel per card.
+
+    Raises:
+        ValueError: If the columns differ in length or contain non-string values.
+    """
+    fields = {"text": text, "description": description, "image_url": image_url, "link": link}
+    lengths = {len(column) for column in fields.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All card columns must have the same length, got lengths {sorted(lengths)}.")
+    for name, column in fields.items():
+        bad = next((index for index, value in enumerate(column) if not isinstance(value, str)), None)
+        if bad is not None:
+            raise ValueError(f"Card column '{name}' must contain strings; card {bad} has {type(column[bad]).__name__}.")
+    count = lengths.pop() if lengths else 0
+    if max_cards is not None:
+        count = min(count, max_cards)
+    cards: List[Dict[str, str]] = [
+        {"text": t, "description": d, "image_url": i, "link": l}
+        for t, d, i, l in islice(zip(text, description, image_url, link), count)
+    ]
+    return {"type": "cards", "cards": cards}
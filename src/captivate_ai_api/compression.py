@@ -0,0 +1,87 @@
+import gzip
+import time
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional: pip install captivate-ai-api[zstd]
+    zstandard = None
+
+SUPPORTED_ENCODINGS = ("gzip", "zstd")
+DEFAULT_COMPRESSION_THRESHOLD = 4 * 1024  # Bodies smaller than this are sent uncompressed
+
+
+def check_encoding(encoding: Optional[str]) -> None:
+    """Raises ValueError if the encoding is unknown or its library is not installed."""
+    if encoding is None:
+        return
+    if encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(f"Unsupported compression '{encoding}'. Expected one of {SUPPORTED_ENCODINGS} or None.")
+    if encoding == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package: pip install captivate-ai-api[zstd]")
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6 if level is None else level, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(body)
+    raise ValueError(f"Unsupported compression '{encoding}'.")
+
+
+class CompressionStats:
+    """Running totals for compressed request bodies, to judge whether compression pays off."""
+
+    def __init__(self):
+        self.requests = 0  # Bodies compressed
+        self.skipped = 0  # Bodies sent uncompressed because they were below the threshold
+        self.original_bytes = 0
+        self.compressed_bytes = 0
+        self.seconds = 0.0  # Total time spent compressing
+
+    def record(self, original: int, compressed: int, seconds: float) -> None:
+        self.requests += 1
+        self.original_bytes += original
+        self.compressed_bytes += compressed
+        self.seconds += seconds
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size over original size (lower is better); 1.0 when nothing was compressed."""
+        return self.compressed_bytes / self.original_bytes if self.original_bytes else 1.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.compressed_bytes
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "skipped": self.skipped,
+            "original_bytes": self.original_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "ratio": self.ratio,
+            "seconds": self.seconds,
+        }
+
+
+def maybe_compress(
+    body: bytes,
+    encoding: Optional[str],
+    threshold: int,
+    level: Optional[int],
+    stats: CompressionStats,
+) -> Tuple[bytes, Optional[str]]:
+    """
+    Compresses a request body if an encoding is configured and the body is at least
+    `threshold` bytes. Returns the body to send and its Content-Encoding (or None).
+    """
+    if encoding is None:
+        return body, None
+    if len(body) < threshold:
+        stats.skipped += 1
+        return body, None
+    started = time.perf_counter()
+    compressed = compress(body, encoding, level)
+    stats.record(len(body), len(compressed), time.perf_counter() - started)
+    return compressed, encoding
@@ -0,0 +1,228 @@
+import asyncio
+import inspect
+import time
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, Sequence, Tuple, TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from .instrumentation import span, STAGE_ACTION
+
+if TYPE_CHECKING:
+    from .Captivate import ActionModel, Captivate
+
+ActionHandler = Callable[["ActionModel", Optional["Captivate"]], Awaitable[Any]]
+
+
+class ActionResult(BaseModel):
+    index: int  # Position of the action in the incoming list
+    action_id: str
+    handled: bool = True  # False when no handler is registered for the action
+    ok: bool
+    result: Optional[Any] = None  # Handler return value on success
+    error: Optional[str] = None  # Error message on failure, timeout or failed dependency
+    exception: Optional[Any] = None  # Original exception on failure
+    elapsed: float = 0.0  # Seconds spent in the handler, excluding time waiting for dependencies
+
+
+class DispatchResult(BaseModel):
+    results: List[ActionResult] = []  # One result per action, in input order
+    elapsed: float = 0.0  # Wall-clock seconds for the whole dispatch
+
+    @property
+    def succeeded(self) -> List[ActionResult]:
+        return [result for result in self.results if result.ok and result.handled]
+
+    @property
+    def failed(self) -> List[ActionResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def unhandled(self) -> List[ActionResult]:
+        return [result for result in self.results if not result.handled]
+
+    def latencies(self) -> Dict[str, float]:
+        """Seconds per handled action id (summed when an id occurs more than once)."""
+        totals: Dict[str, float] = {}
+        for result in self.results:
+            if result.handled:
+                totals[result.action_id] = totals.get(result.action_id, 0.0) + result.elapsed
+        return totals
+
+
+class ActionDispatcher:
+    """
+    Registry mapping incoming action ids to async handlers, looked up in O(1).
+
+    Handlers of one dispatch run concurrently. A handler registered with
+    `after=[...]` waits for the handlers of those action ids in the same batch,
+    and is skipped if one of them failed. Action ids absent from the batch are
+    ignored, so dependencies only order what is actually there.
+
+    Example:
+        dispatcher = ActionDispatcher()
+
+        @dispatcher.on("fetchOrder")
+        async def fetch_order(action, captivate):
+            return await orders.get(action.payload["orderId"])
+
+        @dispatcher.on("sendEmail", after=["fetchOrder"])
+        async def send_email(action, captivate):
+            ...
+
+        result = await captivate.dispatch_incoming_actions(dispatcher, timeout=5)
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, Tuple[ActionHandler, Tuple[str, ...]]] = {}
+
+    def register(self, action_id: str, handler: ActionHandler, after: Iterable[str] = ()) -> None:
+        """Registers (or replaces) the handler for an action id."""
+        if not (inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(getattr(handler, "__call__", None))):
+            raise ValueError(f"Handler for action '{action_id}' must be an async function.")
+        self._handlers[action_id] = (handler, tuple(after))
+
+    def on(self, action_id: str, after: Iterable[str] = ()) -> Callable[[ActionHandler], ActionHandler]:
+        """Decorator form of register()."""
+        def decorator(handler: ActionHandler) -> ActionHandler:
+            self.register(action_id, handler, after)
+            return handler
+        return decorator
+
+    def unregister(self, action_id: str) -> None:
+        self._handlers.pop(action_id, None)
+
+    def get(self, action_id: str) -> Optional[ActionHandler]:
+        entry = self._handlers.get(action_id)
+        return entry[0] if entry is not None else None
+
+    def __contains__(self, action_id: str) -> bool:
+        return action_id in self._handlers
+
+    def _check_cycles(self, present: Iterable[str]) -> None:
+        """Raises ValueError if the dependencies among the present action ids form a cycle."""
+        present = set(present)
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(action_id: str, path: List[str]) -> None:
+            if state.get(action_id) == 2:
+                return
+            if state.get(action_id) == 1:
+                cycle = path[path.index(action_id):] + [action_id]
+                raise ValueError(f"Action handler dependencies form a cycle: {' -> '.join(cycle)}.")
+            state[action_id] = 1
+            for dependency in self._handlers[action_id][1]:
+                if dependency in present and dependency in self._handlers:
+                    visit(dependency, path + [action_id])
+            state[action_id] = 2
+
+        for action_id in present:
+            if action_id in self._handlers:
+                visit(action_id, [])
+
+    async def dispatch(
+        self,
+        actions: Sequence["ActionModel"],
+        captivate: Optional["Captivate"] = None,
+        timeout: Optional[float] = None,
+    ) -> DispatchResult:
+        """
+        Runs the handlers of the given actions concurrently, honouring declared dependencies.
+
+        A failing handler does not cancel the others; handlers still running when the
+        timeout expires are cancelled and reported as failed. Cancelling dispatch
+        cancels the handlers still running.
+
+        Args:
+            actions (Sequence[ActionModel]): Actions to dispatch, e.g. captivate.get_incoming_action().
+            captivate (Captivate, optional): Passed to every handler as its second argument.
+            timeout (float, optional): Seconds allowed for the whole dispatch.
+
+        Returns:
+            DispatchResult: Per-action results in input order, with per-handler latency.
+
+        Raises:
+            ValueError: If the dependencies of the actions present form a cycle.
+        """
+        started = time.perf_counter()
+        self._check_cycles(action.id for action in actions)
+        session_id = captivate.session_id if captivate is not None else None
+
+        results: List[Optional[ActionResult]] = [None] * len(actions)
+        tasks_by_id: Dict[str, List[asyncio.Task]] = {}
+        tasks: Dict[asyncio.Task, int] = {}
+
+        async def run(index: int, action: "ActionModel", handler: ActionHandler, after: Tuple[str, ...]) -> None:
+            for dependency in after:
+                for task in tasks_by_id.get(dependency, ()):
+                    await asyncio.wait({task})
+                    failed = results[tasks[task]]
+                    if failed is not None and not failed.ok:
+                        results[index] = ActionResult(
+                            index=index, action_id=action.id, ok=False,
+                            error=f"Skipped: dependency '{dependency}' failed.",
+                        )
+                        return
+            handler_started = time.perf_counter()
+            try:
+                with span(STAGE_ACTION, session_id, action=action.id):
+                    value = await handler(action, captivate)
+            except Exception as e:
+                results[index] = ActionResult(
+                    index=index, action_id=action.id, ok=False, error=f"{type(e).__name__}: {e}",
+                    exception=e, elapsed=time.perf_counter() - handler_started,
+                )
+            else:
+                results[index] = ActionResult(
+                    index=index, action_id=action.id, ok=True, result=value,
+                    elapsed=time.perf_counter() - handler_started,
+                )
+
+        for index, action in enumerate(actions):
+            entry = self._handlers.get(action.id)
+            if entry is None:
+                results[index] = ActionResult(index=index, action_id=action.id, handled=False, ok=True)
+                continue
+            task = asyncio.ensure_future(run(index, action, *entry))
+            tasks[task] = index
+            tasks_by_id.setdefault(action.id, []).append(task)
+
+        if tasks:
+            try:
+                _, pending = await asyncio.wait(tasks, timeout=timeout)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+                    for task in pending:
+                        index = tasks[task]
+                        if results[index] is None:
+                            results[index] = ActionResult(
+                                index=index, action_id=actions[index].id, ok=False,
+                                error=f"TimeoutError: handler did not finish within {timeout}s.",
+                            )
+            finally:
+                # When dispatch itself is cancelled (e.g. a request timeout), no handler keeps running detached
+                unfinished = [task for task in tasks if not task.done()]
+                for task in unfinished:
+                    task.cancel()
+                if unfinished:
+                    await asyncio.gather(*unfinished, return_exceptions=True)
+
+        return DispatchResult(results=results, elapsed=time.perf_counter() - started)
+
+
+_default_dispatcher: Optional[ActionDispatcher] = None
+
+
+def get_default_dispatcher() -> ActionDispatcher:
+    """Returns the library-wide action dispatcher, creating it on first use."""
+    global _default_dispatcher
+    if _default_dispatcher is None:
+        _default_dispatcher = ActionDispatcher()
+    return _default_dispatcher
+
+
+def set_default_dispatcher(dispatcher: Optional[ActionDispatcher]) -> None:
+    """Replaces the library-wide action dispatcher (None resets it to an empty one)."""
+    global _default_dispatcher
+    _default_dispatcher = dispatcher
@@ -0,0 +1,103 @@
+import tempfile
+from typing import Optional, Dict, Any, AsyncIterator, BinaryIO
+
+from pydantic import BaseModel
+
+from .client import CaptivateClient
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # Bytes read from the network per chunk
+DEFAULT_SPOOL_THRESHOLD = 8 * 1024 * 1024  # Bytes kept in memory before spilling to disk
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a download exceeds the allowed number of bytes."""
+
+    def __init__(self, url: str, max_bytes: int, size: Optional[int] = None):
+        self.url = url
+        self.max_bytes = max_bytes
+        self.size = size
+        detail = f"{size} bytes" if size is not None else f"more than {max_bytes} bytes"
+        super().__init__(f"File at '{url}' is too large ({detail}); the limit is {max_bytes} bytes.")
+
+
+class FileDownloadResult(BaseModel):
+    index: int  # Position of the file in the input list
+    filename: Optional[str] = None
+    ok: bool
+    data: Optional[Any] = None  # File stream (io.BytesIO or SpooledTemporaryFile) on success
+    error: Optional[str] = None  # Error message on failure
+    exception: Optional[Any] = None  # Original exception on failure
+    elapsed: float = 0.0  # Seconds spent downloading this file
+
+
+def _file_url(file_info: Dict[str, Any]) -> str:
+    """
+    Returns the download URL of a file dict: 'url' if present, otherwise the
+    'storage.presignedUrl' sent by the frontend.
+    """
+    url = file_info.get("url") or (file_info.get("storage") or {}).get("presignedUrl")
+    if not url:
+        raise ValueError("Missing 'url' key in file_info dictionary.")
+    return url
+
+
+def _declared_size(file_info: Dict[str, Any]) -> Optional[int]:
+    """Returns 'storage.fileSize' from a file dict, if present."""
+    size = (file_info.get("storage") or {}).get("fileSize")
+    return size if isinstance(size, int) else None
+
+
+async def iter_file_chunks(
+    client: CaptivateClient,
+    file_info: Dict[str, Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_bytes: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Streams a file in chunks without holding the whole body in memory.
+
+    When max_bytes is set the download is refused up front if 'storage.fileSize'
+    or the Content-Length header already exceeds it, and aborted as soon as the
+    received bytes go over it.
+
+    Raises:
+        FileTooLargeError: If the file is larger than max_bytes.
+    """
+    url = _file_url(file_info)
+    if max_bytes is not None:
+        declared = _declared_size(file_info)
+        if declared is not None and declared > max_bytes:
+            raise FileTooLargeError(url, max_bytes, declared)
+
+    async with client.http.stream("GET", url) as response:
+        response.raise_for_status()  # Raise an error for failed requests
+        if max_bytes is not None:
+            content_length = response.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise FileTooLargeError(url, max_bytes, int(content_length))
+
+        received = 0
+        async for chunk in response.aiter_bytes(chunk_size):
+            received += len(chunk)
+            if max_bytes is not None and received > max_bytes:
+                raise FileTooLargeError(url, max_bytes)
+            yield chunk
+
+
+async def download_to_buffer(
+    client: CaptivateClient,
+    file_info: Dict[str, Any],
+    buffer: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_bytes: Optional[int] = None,
+) -> BinaryIO:
+    """Streams a file into the given writable buffer and rewinds it."""
+    async for chunk in iter_file_chunks(client, file_info, chunk_size, max_bytes):
+        buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
+
+
+def spooled_buffer(spool_threshold: int = DEFAULT_SPOOL_THRESHOLD) -> BinaryIO:
+    """A buffer kept in memory up to spool_threshold bytes, then moved to a temporary file on disk."""
+    return tempfile.SpooledTemporaryFile(max_size=spool_threshold, mode="w+b")
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Awaitable, Callable, Tuple
+
+import httpx
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+DEFAULT_DEDUPE_ENTRIES = 10_000
+DEFAULT_DEDUPE_WINDOW = 300.0  # Seconds a successful send suppresses repeats of the same key
+
+
+class DedupeTable:
+    """
+    Bounded in-process table of recently delivered idempotency keys.
+
+    A send whose key was delivered successfully within `window` seconds is not
+    sent again: the response of the first delivery is returned instead. A
+    concurrent send of a key that is still in flight waits for it. Failed sends
+    are not recorded, so they can be retried.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_DEDUPE_ENTRIES, window: float = DEFAULT_DEDUPE_WINDOW):
+        """
+        Args:
+            max_entries (int): Keys kept; the oldest are forgotten beyond it.
+            window (float): Seconds after a successful send during which repeats are dropped.
+        """
+        self.max_entries = max_entries
+        self.window = window
+        self._entries: "OrderedDict[str, Tuple[float, httpx.Response]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Event] = {}
+        self.sent = 0
+        self.suppressed = 0
+
+    def get(self, key: str) -> Optional[httpx.Response]:
+        """Returns the response of a delivery of key within the window, if any."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        delivered_at, response = entry
+        if time.monotonic() - delivered_at > self.window:
+            del self._entries[key]
+            return None
+        return response
+
+    def record(self, key: str, response: httpx.Response) -> None:
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def send_once(self, key: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Runs send() unless key was already delivered (or is being delivered) within the window."""
+        while True:
+            response = self.get(key)
+            if response is not None:
+                self.suppressed += 1
+                return response
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            await in_flight.wait()  # Then re-check: recorded on success, free to retry on failure
+
+        done = self._in_flight[key] = asyncio.Event()
+        try:
+            response = await send()
+            self.sent += 1
+            if response.is_success:
+                self.record(key, response)
+            return response
+        finally:
+            del self._in_flight[key]
+            done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"sent": self.sent, "suppressed": self.suppressed, "entries": len(self._entries)}
@@ -0,0 +1,188 @@
+import bisect
+import time
+from typing import Optional, Dict, Any, List, Callable
+
+# Stages emitted by the library
+STAGE_CREATE = "create"  # Captivate.create / from_json: parsing and validation of the request
+STAGE_METADATA = "metadata"  # set_metadata / set_private_metadata: key and value validation
+STAGE_SERIALIZE = "serialize"  # get_response / get_response_json
+STAGE_SEND = "send"  # async_send_message: the network round trip
+STAGE_DOWNLOAD = "download"  # download_file_to_memory
+STAGE_ACTION = "action"  # dispatch_incoming_actions: one incoming action handler
+
+
+class StageEvent:
+    """Timing of one library stage, passed to every stage listener."""
+
+    __slots__ = ("stage", "session_id", "duration", "attributes", "error")
+
+    def __init__(self, stage: str, session_id: Optional[str], duration: float, attributes: Dict[str, Any], error: Optional[str]):
+        self.stage = stage
+        self.session_id = session_id
+        self.duration = duration  # Seconds
+        self.attributes = attributes  # e.g. {"bytes": 1234}
+        self.error = error  # "ExceptionType: message" if the stage raised
+
+    def __repr__(self) -> str:
+        return f"StageEvent(stage={self.stage!r}, session_id={self.session_id!r}, duration={self.duration:.6f}, attributes={self.attributes!r}, error={self.error!r})"
+
+
+StageListener = Callable[[StageEvent], None]
+
+_listeners: List[StageListener] = []
+
+
+def add_stage_listener(listener: StageListener) -> None:
+    """Registers a callback receiving a StageEvent after each instrumented stage."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_stage_listener(listener: StageListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class _Span:
+    __slots__ = ("stage", "session_id", "attributes", "_started")
+
+    def __init__(self, stage: str, session_id: Optional[str], attributes: Dict[str, Any]):
+        self.stage = stage
+        self.session_id = session_id
+        self.attributes = attributes
+
+    def set(self, session_id: Optional[str] = None, **attributes: Any) -> None:
+        """Attaches attributes (e.g. payload sizes) known only once the stage has run."""
+        if session_id is not None:
+            self.session_id = session_id
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "_Span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = time.perf_counter() - self._started
+        error = f"{exc_type.__name__}: {exc}" if exc_type is not None else None
+        event = StageEvent(self.stage, self.session_id, duration, self.attributes, error)
+        for listener in list(_listeners):
+            try:
+                listener(event)
+            except Exception:
+                pass  # Instrumentation must never break the request
+
+
+class _NoopSpan:
+    """Returned while no listener is registered, so disabled instrumentation costs next to nothing."""
+
+    __slots__ = ()
+
+    def set(self, session_id: Optional[str] = None, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(stage: str, session_id: Optional[str] = None, **attributes: Any):
+    """
+    Context manager timing a stage and reporting it to the registered listeners.
+
+    Example:
+        with span(STAGE_SEND, session_id) as s:
+            response = await client.send_json(url, body)
+            s.set(bytes=len(body), status=response.status_code)
+    """
+    if not _listeners:
+        return _NOOP_SPAN
+    return _Span(stage, session_id, attributes)
+
+
+# Histogram bucket upper bounds in seconds, roughly logarithmic from 10 us to 30 s
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "count", "total", "min", "max", "errors")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last bucket holds everything above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+
+class HistogramCollector:
+    """
+    In-memory stage listener keeping a latency histogram per stage.
+
+    Example:
+        collector = HistogramCollector()
+        add_stage_listener(collector)
+        ...
+        print(collector.summary())
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[str, _Histogram] = {}
+
+    def __call__(self, event: StageEvent) -> None:
+        histogram = self._histograms.get(event.stage)
+        if histogram is None:
+            histogram = self._histograms[event.stage] = _Histogram(self.buckets)
+        histogram.observe(event.duration)
+        if event.error is not None:
+            histogram.errors += 1
+
+    def reset(self) -> None:
+        self._histograms.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage count, errors, mean/min/max and approximate p50/p95/p99, in seconds."""
+        return {
+            stage: {
+                "count": h.count,
+                "errors": h.errors,
+                "mean": h.total / h.count if h.count else 0.0,
+                "min": h.min if h.count else 0.0,
+                "max": h.max,
+                "p50": h.percentile(50),
+                "p95": h.percentile(95),
+                "p99": h.percentile(99),
+                "buckets": dict(zip([*map(str, h.bounds), "+Inf"], h.counts)),
+            }
+            for stage, h in self._histograms.items()
+        }
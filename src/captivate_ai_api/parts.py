@@ -0,0 +1,98 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Optional
+
+_SINGLE_HEAD = b'{"response":['
+_PART_HEAD = b'{"part":{"index":,"total":},"response":['  # Without the two numbers
+_RESPONSE_END = b"],"  # Closes the response list before the other members
+
+
+class ResponseTooLargeError(ValueError):
+    """Raised when a single message does not fit in the byte budget, even alone in a part."""
+
+    def __init__(self, index: Optional[int], size: int, max_bytes: int):
+        self.index = index  # None when the envelope alone (session, metadata, actions) is too large
+        self.size = size
+        self.max_bytes = max_bytes
+        if index is None:
+            message = (
+                f"The response envelope alone is {size} bytes and cannot fit in a part of at most "
+                f"{max_bytes} bytes; shrink the metadata or raise the budget."
+            )
+        else:
+            message = (
+                f"Message {index} is {size} bytes and cannot fit in a part of at most {max_bytes} bytes; "
+                "shorten it (e.g. render_table(max_rows=...)) or raise the budget."
+            )
+        super().__init__(message)
+
+
+def pack_parts(
+    messages: bytes,
+    separator: bytes,
+    count: int,
+    members: bytes,
+    last_members: bytes,
+    max_bytes: int,
+) -> List[bytes]:
+    """
+    Packs already-serialized messages, in order, into as few sendMessage bodies
+    as fit in max_bytes. Bodies are assembled from complete JSON values, so any
+    JSON encoder may have produced the pieces.
+
+    When everything fits, the result is the single body
+    {"response":[...],<last_members>}, and the size is known without splitting the
+    messages. Otherwise every body gets a leading "part": {"index", "total"} marker
+    and a slice of the messages; the last body ends with last_members (which carry
+    the outgoing actions), the others with members.
+
+    Args:
+        messages (bytes): The messages' JSON, separated by separator (see serialization.dump_json_joined).
+        separator (bytes): Separator between two messages, found nowhere else in messages.
+        count (int): Number of messages.
+        members (bytes): The other object members, e.g. b'"session_id":"s","metadata":{...},...',
+            used for every part but the last.
+        last_members (bytes): The other object members of the last (or only) body.
+        max_bytes (int): Size limit of one body.
+
+    Raises:
+        ResponseTooLargeError: If a single message, or the envelope alone, cannot fit in a part.
+    """
+    gaps = max(0, count - 1)
+    messages_size = len(messages) - gaps * (len(separator) - 1)  # With commas between the messages
+    single_size = len(_SINGLE_HEAD) + messages_size + len(_RESPONSE_END) + len(last_members) + 1
+    if single_size <= max_bytes:
+        joined = messages.replace(separator, b",") if gaps else messages
+        return [_SINGLE_HEAD + joined + _RESPONSE_END + last_members + b"}"]
+
+    digits = len(str(count))  # There are never more parts than messages
+    overhead = len(_PART_HEAD) + 2 * digits + len(_RESPONSE_END) + max(len(members), len(last_members)) + 1
+    budget = max_bytes - overhead + 1  # Room for the messages, each followed by a comma
+    if budget <= 1:
+        raise ResponseTooLargeError(None, overhead, max_bytes)
+
+    pieces = messages.split(separator) if count else []
+    sizes = [len(piece) + 1 for piece in pieces]  # Each message followed by a comma
+    for index, size in enumerate(sizes):
+        if size > budget:
+            raise ResponseTooLargeError(index, size - 1 + overhead, max_bytes)
+
+    # Greedy packing on the running totals: each part takes as many messages as fit
+    ends = list(accumulate(sizes))
+    groups: List[List[bytes]] = []
+    start = used = 0
+    while start < len(pieces):
+        stop = bisect_right(ends, used + budget, start)
+        groups.append(pieces[start:stop])
+        start, used = stop, ends[stop - 1]
+    groups = groups or [[]]
+
+    total = len(groups)
+    return [
+        b'{"part":{"index":%d,"total":%d},"response":[' % (index, total)
+        + b",".join(group)
+        + _RESPONSE_END
+        + (last_members if index == total - 1 else members)
+        + b"}"
+        for index, group in enumerate(groups)
+    ]
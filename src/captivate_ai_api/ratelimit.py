@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import Optional, Dict, Any, Tuple
+
+Limit = Tuple[float, int]  # (requests per second, burst size)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `burst` tokens.
+    Waiters are served first come, first served, and the wait time of every
+    acquisition is recorded.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.delayed = 0  # Acquisitions that had to wait
+        self.waiting = 0  # Callers currently waiting
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Takes one token, waiting for it if needed. Returns the seconds waited."""
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:  # Only the head of the line sleeps; the rest queue behind it
+                self._refill()
+                if self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    self._refill()
+                self.tokens -= 1
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if waited > 0.001:
+            self.delayed += 1
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "waiting": self.waiting,
+            "mean_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class RateLimiter:
+    """
+    Shared outbound rate limiter with one token bucket per endpoint URL and,
+    optionally, one per (URL, channel). A send takes a token from its URL bucket
+    and, when its channel has a limit, from the channel bucket too.
+
+    Example:
+        limiter = RateLimiter(
+            rate=20,
+            url_limits={"https://channel.prod.captivat.io/api/channel/v2/sendMessage": (50, 100)},
+            channel_limits={"whatsapp": (5, 10)},
+        )
+        client = CaptivateClient(rate_limiter=limiter)
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[int] = None,
+        url_limits: Optional[Dict[str, Limit]] = None,
+        channel_limits: Optional[Dict[str, Limit]] = None,
+    ):
+        """
+        Args:
+            rate (float): Default requests per second for each URL.
+            burst (int, optional): Default burst size; defaults to the rate.
+            url_limits (Dict[str, Tuple[float, int]], optional): (rate, burst) overrides per URL.
+            channel_limits (Dict[str, Tuple[float, int]], optional): (rate, burst) per channel name,
+                applied per URL on top of the URL limit. Channels not listed are only URL limited.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.url_limits = dict(url_limits or {})
+        self.channel_limits = dict(channel_limits or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, key: str, limit: Limit) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(*limit)
+        return bucket
+
+    async def acquire(self, url: str, channel: Optional[str] = None) -> float:
+        """Waits until a request to url (for channel) may be sent. Returns the seconds waited."""
+        waited = await self._bucket(url, self.url_limits.get(url, (self.rate, self.burst))).acquire()
+        if channel is not None and channel in self.channel_limits:
+            waited += await self._bucket(f"{url}|{channel}", self.channel_limits[channel]).acquire()
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue-wait metrics per bucket, keyed by URL or 'URL|channel'."""
+        return {key: bucket.stats() for key, bucket in self._buckets.items()}
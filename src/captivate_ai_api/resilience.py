@@ -0,0 +1,247 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Optional, Dict, Awaitable, Callable, Deque, Iterable
+
+import httpx
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without sending anything while the circuit for an endpoint is open."""
+
+    def __init__(self, url: str, retry_in: float):
+        self.url = url
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for '{url}': failing fast, next attempt allowed in {retry_in:.1f}s.")
+
+
+class RetryPolicy:
+    """Retries with exponential backoff and full jitter for failed sends."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+    ):
+        """
+        Args:
+            max_attempts (int): Total attempts, including the first one.
+            backoff_base (float): Delay in seconds before the first retry; doubled for each further retry.
+            backoff_max (float): Upper bound for a single delay in seconds.
+            jitter (bool): Draw each delay uniformly between 0 and the backoff ("full jitter").
+            retry_statuses (Iterable[int]): HTTP statuses worth retrying. Transport errors
+                (connection failures, timeouts) are always retried.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, retry: int) -> float:
+        """Delay before the given retry (0 for the first retry)."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** retry))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class HedgePolicy:
+    """
+    Fires a second, identical request when the first one is slower than a latency
+    percentile of recent requests to the same endpoint; the first response wins.
+    Only enable it for endpoints that tolerate duplicates (see idempotency keys).
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        window: int = 200,
+        min_samples: int = 20,
+        default_delay: float = 0.5,
+        min_delay: float = 0.01,
+        max_delay: float = 5.0,
+    ):
+        """
+        Args:
+            percentile (float): Latency percentile (0-100) after which the hedge fires.
+            window (int): Number of recent latencies kept per endpoint.
+            min_samples (int): Samples needed before the percentile is trusted; default_delay is used until then.
+            default_delay (float): Hedge delay in seconds while there are too few samples.
+            min_delay (float): Lower bound for the hedge delay in seconds.
+            max_delay (float): Upper bound for the hedge delay in seconds.
+        """
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def record(self, url: str, latency: float) -> None:
+        samples = self._latencies.get(url)
+        if samples is None:
+            samples = self._latencies[url] = deque(maxlen=self.window)
+        samples.append(latency)
+
+    def delay(self, url: str) -> float:
+        samples = self._latencies.get(url)
+        if not samples or len(samples) < self.min_samples:
+            delay = self.default_delay
+        else:
+            ordered = sorted(samples)
+            delay = ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+        return max(self.min_delay, min(self.max_delay, delay))
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker. After `failure_threshold` consecutive failures
+    (transport errors or 5xx responses) the circuit opens and sends fail fast
+    with CircuitOpenError. After `reset_timeout` seconds one trial request is let
+    through; its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial_in_flight: Dict[str, bool] = {}
+
+    def state(self, url: str) -> str:
+        opened_at = self._opened_at.get(url)
+        if opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def check(self, url: str) -> None:
+        """Raises CircuitOpenError if a request to url must not be sent now."""
+        state = self.state(url)
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._trial_in_flight.get(url):
+            self._trial_in_flight[url] = True
+            return
+        retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at[url]))
+        raise CircuitOpenError(url, retry_in)
+
+    def record_success(self, url: str) -> None:
+        self._failures.pop(url, None)
+        self._opened_at.pop(url, None)
+        self._trial_in_flight.pop(url, None)
+
+    def release_trial(self, url: str) -> None:
+        """Gives up a trial that ended without an outcome (e.g. cancelled), so a new one may start."""
+        self._trial_in_flight.pop(url, None)
+
+    def record_failure(self, url: str) -> None:
+        failures = self._failures.get(url, 0) + 1
+        self._failures[url] = failures
+        was_trial = self._trial_in_flight.pop(url, False)
+        if failures >= self.failure_threshold or was_trial:
+            self._opened_at[url] = time.monotonic()
+
+
+def _is_failure(response: Optional[httpx.Response]) -> bool:
+    """Whether an outcome counts against the circuit: transport errors and 5xx."""
+    return response is None or response.status_code >= 500
+
+
+async def _hedged(
+    send: Callable[[], Awaitable[httpx.Response]],
+    url: str,
+    hedge: HedgePolicy,
+) -> httpx.Response:
+    """Runs send(), firing a second send() if the first exceeds the hedge delay. First success wins."""
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(send())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge.delay(url))
+        if done:
+            response = tasks[0].result()
+            hedge.record(url, time.perf_counter() - started)
+            return response
+
+        hedge.hedges_fired += 1
+        tasks.append(asyncio.ensure_future(send()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is tasks[1]:
+                        hedge.hedges_won += 1
+                    hedge.record(url, time.perf_counter() - started)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # The losing request, or both when the caller gives up, must not keep running detached
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+
+async def send_with_resilience(
+    send: Callable[[], Awaitable[httpx.Response]],
+    url: str,
+    retry: Optional[RetryPolicy] = None,
+    hedge: Optional[HedgePolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> httpx.Response:
+    """
+    Sends a request with optional retries, hedging and circuit breaking.
+
+    Returns the last response (possibly an error status once retries are exhausted,
+    for the caller's raise_for_status), or raises the last transport error. Other
+    exceptions, including cancellation, are not retried and do not count against
+    the circuit; they only give up a half-open trial so another one can start.
+
+    Raises:
+        CircuitOpenError: If the circuit for url is open.
+    """
+    attempts = retry.max_attempts if retry is not None else 1
+    for attempt in range(attempts):
+        if breaker is not None:
+            breaker.check(url)
+        last_attempt = attempt == attempts - 1
+        try:
+            response = await (_hedged(send, url, hedge) if hedge is not None else send())
+        except httpx.TransportError:
+            if breaker is not None:
+                breaker.record_failure(url)
+            if last_attempt:
+                raise
+        except BaseException:
+            # Cancellation (e.g. the caller's asyncio.wait_for) or an unexpected error says
+            # nothing about the endpoint's health: never leave a half-open trial in flight
+            if breaker is not None:
+                breaker.release_trial(url)
+            raise
+        else:
+            if breaker is not None:
+                (breaker.record_failure if _is_failure(response) else breaker.record_success)(url)
+            if last_attempt or response.status_code not in retry.retry_statuses:
+                return response
+            await response.aclose()
+        await asyncio.sleep(retry.backoff(attempt))
+    raise AssertionError("unreachable")  # pragma: no cover
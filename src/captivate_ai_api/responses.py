@@ -0,0 +1,31 @@
+from typing import Any
+
+try:
+    from starlette.responses import JSONResponse
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "captivate_ai_api.responses requires FastAPI/Starlette. Install it with: pip install fastapi"
+    ) from e
+
+
+
+class CaptivateJSONResponse(JSONResponse):
+    """
+    FastAPI/Starlette response that sends pre-serialized JSON bytes as-is,
+    e.g. the output of Captivate.get_response_json(), instead of encoding the
+    content again. Any other content is JSON-encoded like a regular JSONResponse.
+
+    Example:
+        @app.post("/chat", response_class=CaptivateJSONResponse)
+        async def chat(request: ChatRequest):
+            captivate = Captivate.create(request)
+            ...
+            return CaptivateJSONResponse(captivate.get_response_json())
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        if hasattr(content, "get_response_json"):
+            return content.get_response_json()
+        return super().render(content)
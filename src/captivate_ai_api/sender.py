@@ -0,0 +1,250 @@
+import asyncio
+from typing import Optional, Dict, Any, List, Tuple
+
+from .client import CaptivateClient, _resolve_client
+from .instrumentation import span, STAGE_SEND
+from .serialization import dump_json_data
+
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_COALESCE_WINDOW = 0.05  # Seconds a session's first queued reply waits for followers
+DEFAULT_MAX_BATCH = 20  # Replies merged into one payload at most
+
+_BatchKey = Tuple[str, str]  # (url, session_id)
+
+
+class _Batch:
+    __slots__ = ("key", "payloads", "body", "keys", "futures", "closed", "created", "channel")
+
+    def __init__(self, key: _BatchKey, created: float, channel: Optional[str]):
+        self.key = key
+        self.created = created  # Loop time of the first reply
+        self.channel = channel  # For per-channel rate limits
+        self.payloads: List[Dict[str, Any]] = []
+        self.body: Optional[bytes] = None  # Encoded first payload, reused when nothing is merged into it
+        self.keys: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.closed = False
+
+
+def merge_payloads(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges response payloads of one session into one: messages and outgoing actions
+    are concatenated in order, metadata and hasLivechat come from the latest payload.
+    """
+    if len(payloads) == 1:
+        return payloads[0]
+    merged = dict(payloads[-1])
+    merged["response"] = [message for payload in payloads for message in payload.get("response") or []]
+    actions = [action for payload in payloads for action in payload.get("outgoing_action") or []]
+    merged["outgoing_action"] = actions or None
+    return merged
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Marks a failed delivery as seen, so fire-and-forget callers do not get 'exception never retrieved' warnings."""
+    if not future.cancelled():
+        future.exception()
+
+
+class BackgroundSender:
+    """
+    Sends responses from background worker tasks, so the request path only pays
+    for queueing. Replies queued for the same session and environment within
+    `coalesce_window` seconds are merged into one payload, in order.
+
+    The queue is bounded: when `max_queue` batches are waiting, enqueue() waits
+    for room (backpressure) instead of growing memory without limit.
+
+    Example (FastAPI lifespan):
+        sender = BackgroundSender(client=client)
+
+        @asynccontextmanager
+        async def lifespan(app):
+            await sender.start()
+            yield
+            await sender.aclose()  # Delivers what is still queued
+    """
+
+    def __init__(
+        self,
+        client: Optional[CaptivateClient] = None,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        coalesce_window: float = DEFAULT_COALESCE_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        workers: int = 4,
+    ):
+        """
+        Args:
+            client (CaptivateClient, optional): Pooled client to use. Defaults to the shared client.
+            max_queue (int): Maximum number of batches waiting to be sent.
+            coalesce_window (float): Seconds to wait for more replies of the same session before sending.
+            max_batch (int): Maximum number of replies merged into one payload.
+            workers (int): Number of concurrent sends. Replies of one session are still delivered in order.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.client = client
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._open: Dict[_BatchKey, _Batch] = {}  # Batches still accepting replies
+        self._locks: Dict[_BatchKey, Tuple[asyncio.Lock, int]] = {}  # Keeps each session's sends in order, with queued batch count
+        self._tasks: List[asyncio.Task] = []
+        self.enqueued = 0
+        self.requests = 0
+        self.failed = 0
+
+    @property
+    def is_started(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> "BackgroundSender":
+        """Start the worker tasks. Calling it more than once is a no-op."""
+        if not self._tasks:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self
+
+    async def aclose(self, drain: bool = True) -> None:
+        """Stop the workers, first delivering everything still queued unless drain is False."""
+        if not self._tasks:
+            return
+        if drain:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for batch in self._open.values():
+            for future in batch.futures:
+                future.cancel()
+        self._open.clear()
+
+    async def __aenter__(self) -> "BackgroundSender":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def enqueue(
+        self,
+        url: str,
+        session_id: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        channel: Optional[str] = None,
+        body: Optional[bytes] = None,
+    ) -> asyncio.Future:
+        """
+        Queues a response payload for delivery and returns once it is queued.
+
+        Args:
+            body (bytes, optional): The payload already encoded with dump_json_data, e.g. to
+                derive its idempotency key. Sent as-is unless other replies are merged in.
+
+        Returns:
+            asyncio.Future: Resolves to the API response of the (possibly merged) send, or
+            its error. Awaiting it is optional.
+        """
+        if not self._tasks:
+            await self.start()
+        key = (url, session_id)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_consume_exception)
+
+        self.enqueued += 1
+        batch = self._open.get(key)
+        if batch is not None and not batch.closed and len(batch.payloads) < self.max_batch:
+            self._add(batch, payload, future, idempotency_key)
+            return future
+
+        batch = self._open[key] = _Batch(key, loop.time(), channel)
+        batch.body = body
+        self._add(batch, payload, future, idempotency_key)
+        lock, queued = self._locks.get(key) or (asyncio.Lock(), 0)
+        self._locks[key] = (lock, queued + 1)
+        await self._queue.put(batch)  # Waits while the queue is full; later replies still join the batch
+        return future
+
+    @staticmethod
+    def _add(batch: _Batch, payload: Dict[str, Any], future: asyncio.Future, idempotency_key: Optional[str]) -> None:
+        batch.payloads.append(payload)
+        batch.futures.append(future)
+        if idempotency_key is not None:
+            batch.keys.append(idempotency_key)
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._queue.get()
+            lock, _ = self._locks[batch.key]
+            try:
+                async with lock:  # Taken before any other await, so batches of a session go out in queue order
+                    wait = batch.created + self.coalesce_window - asyncio.get_running_loop().time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    await self._send(batch)
+            finally:
+                lock, queued = self._locks[batch.key]
+                if queued == 1:
+                    del self._locks[batch.key]
+                else:
+                    self._locks[batch.key] = (lock, queued - 1)
+                self._queue.task_done()
+
+    async def _send(self, batch: _Batch) -> None:
+        batch.closed = True
+        if self._open.get(batch.key) is batch:
+            del self._open[batch.key]
+        url, session_id = batch.key
+        if len(batch.payloads) == 1 and batch.body is not None:
+            body = batch.body
+        else:
+            body = dump_json_data(merge_payloads(batch.payloads))
+        idempotency_key = ",".join(batch.keys) if batch.keys else None
+        try:
+            with span(STAGE_SEND, session_id, url=url, bytes=len(body), merged=len(batch.payloads)) as stage:
+                response = await _resolve_client(self.client).send_json(
+                    url, body, idempotency_key=idempotency_key, channel=batch.channel
+                )
+                stage.set(status=response.status_code)
+                response.raise_for_status()
+            result = response.json()
+        except Exception as e:
+            self.failed += 1
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self.requests += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "requests": self.requests,
+            "failed": self.failed,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+_default_sender: Optional[BackgroundSender] = None
+
+
+def get_default_sender() -> BackgroundSender:
+    """Returns the library-wide background sender, creating it on first use."""
+    global _default_sender
+    if _default_sender is None:
+        _default_sender = BackgroundSender()
+    return _default_sender
+
+
+def set_default_sender(sender: Optional[BackgroundSender]) -> None:
+    """Replaces the library-wide background sender (None resets it to the defaults)."""
+    global _default_sender
+    _default_sender = sender
@@ -0,0 +1,74 @@
+import secrets
+from functools import partial
+from typing import Any, Callable, List, Optional, Tuple
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+JSON_CONTENT_TYPE = "application/json"
+
+# Encoder turning plain Python data (dicts, lists, str, ...) into JSON bytes, e.g. orjson.dumps
+JsonEncoder = Callable[[Any], bytes]
+
+_json_encoder: Optional[JsonEncoder] = None
+
+
+def set_json_encoder(encoder: Optional[JsonEncoder]) -> None:
+    """
+    Plugs in a faster JSON encoder (e.g. orjson.dumps) for serializing responses.
+    With None (the default) pydantic-core serializes models straight to bytes.
+    """
+    global _json_encoder
+    _json_encoder = encoder
+
+
+def get_json_encoder() -> Optional[JsonEncoder]:
+    return _json_encoder
+
+
+def dump_json(model: BaseModel) -> bytes:
+    """Serializes a model to its final JSON wire bytes in one step."""
+    if _json_encoder is not None:
+        return _json_encoder(model.model_dump())
+    return model.__pydantic_serializer__.to_json(model, by_alias=False)
+
+
+def dump_json_data(data: Any) -> bytes:
+    """Serializes plain Python data (dicts, lists, ...) to JSON bytes."""
+    if _json_encoder is not None:
+        return _json_encoder(data)
+    return to_json(data)
+
+
+def dump_json_joined(items: List[Any]) -> Tuple[bytes, bytes]:
+    """
+    Serializes the items of a list (models or plain data) in a single encoder call.
+
+    Returns (joined, separator): the items' JSON in order, separated by `separator`,
+    which occurs nowhere else. joined.split(separator) gives each item's JSON and
+    joined.replace(separator, b",") the contents of the JSON list.
+
+    The items are encoded as one list with a random marker string between them; the
+    exact separator bytes come from a small probe list, so any encoder's spacing works.
+    If an item happens to contain the marker, the items are encoded one by one and
+    joined with a NUL byte, which JSON output never contains.
+    """
+    if not items:
+        return b"", b"\x00"
+    marker = "\x00" + secrets.token_hex(8)
+    if _json_encoder is not None:
+        items = [item.model_dump() if isinstance(item, BaseModel) else item for item in items]
+        encode = _json_encoder
+    else:
+        encode = partial(to_json, by_alias=False)
+    # e.g. b'[0,"\\u0000c0ffee",0]': what precedes the first item, separates the items and follows the last
+    probe = encode([0, marker, 0])
+    start, end = probe.index(b"0") + 1, probe.rindex(b"0")
+    separator = probe[start:end]
+    interleaved = [marker] * (2 * len(items) - 1)
+    interleaved[::2] = items
+    encoded = encode(interleaved)
+    joined = encoded[start - 1:len(encoded) - (len(probe) - end - 1)]
+    if joined.count(separator) != len(items) - 1:
+        return b"\x00".join(encode(item) for item in items), b"\x00"
+    return joined, separator
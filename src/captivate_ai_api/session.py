@@ -0,0 +1,215 @@
+import marshal
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+# Snapshot layout: magic + format version, the Python version and marshal version that
+# wrote it, then a marshal-encoded (metadata, state) tuple. marshal's format is only
+# guaranteed within one Python version, so snapshots from another one are rejected.
+SNAPSHOT_MAGIC = b"CPT2"
+_MARSHAL_VERSION = 4
+_SNAPSHOT_HEADER = SNAPSHOT_MAGIC + bytes((sys.version_info[0], sys.version_info[1], _MARSHAL_VERSION))
+
+
+class SessionSnapshot:
+    """Saved state of one conversation: the metadata dump and the agent's own state."""
+
+    __slots__ = ("metadata", "state")
+
+    def __init__(self, metadata: Dict[str, Any], state: Dict[str, Any]):
+        self.metadata = metadata
+        self.state = state
+
+
+def dump_snapshot(metadata: Dict[str, Any], state: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    Encodes metadata and state as a compact binary snapshot. Values must be
+    JSON-like (dict, list, str, int, float, bool, None), which metadata already
+    guarantees. Tuples and sets are accepted as well and come back as such.
+    """
+    try:
+        return _SNAPSHOT_HEADER + marshal.dumps((metadata, state or {}), _MARSHAL_VERSION)
+    except ValueError as e:
+        raise ValueError(f"Session state cannot be snapshotted: {e}") from e
+
+
+def load_snapshot(data: bytes) -> SessionSnapshot:
+    """
+    Decodes a snapshot made by dump_snapshot. Snapshots are trusted local data
+    (marshal is not meant for untrusted input); only read them from stores you own.
+
+    Raises:
+        ValueError: If the data is not a snapshot, was written by another Python
+            version, or is corrupt.
+    """
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a Captivate session snapshot (bad header).")
+    if data[:len(_SNAPSHOT_HEADER)] != _SNAPSHOT_HEADER:
+        raise ValueError("Session snapshot was written by another Python or marshal version.")
+    try:
+        metadata, state = marshal.loads(data[len(_SNAPSHOT_HEADER):])
+    except (EOFError, ValueError, TypeError) as e:
+        raise ValueError(f"Corrupt session snapshot: {e}") from e
+    if not isinstance(metadata, dict) or not isinstance(state, dict):
+        raise ValueError("Corrupt session snapshot: expected metadata and state dicts.")
+    return SessionSnapshot(metadata, state)
+
+
+class SessionStore(ABC):
+    """
+    Base class for session stores keyed by session_id. Subclasses implement
+    `_load`, `_store`, `_discard` and `clear`; snapshot encoding, TTL checks
+    and hit and miss counting live here. Snapshots that cannot be decoded
+    (corrupt, or written by another Python version) count as misses and are discarded.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Args:
+            ttl (float, optional): Seconds a session is kept after it was last saved. None keeps it until evicted.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalid = 0  # Snapshots discarded because they could not be decoded
+
+    @abstractmethod
+    def _load(self, session_id: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        ...
+
+    @abstractmethod
+    def _store(self, session_id: str, data: bytes, expires_at: Optional[float]) -> None:
+        ...
+
+    @abstractmethod
+    def _discard(self, session_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def get(self, session_id: str) -> Optional[SessionSnapshot]:
+        """Returns the saved snapshot of a session, or None if it is missing, expired or unreadable."""
+        entry = self._load(session_id)
+        if entry is not None:
+            data, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                try:
+                    snapshot = load_snapshot(data)
+                except ValueError:
+                    self.invalid += 1
+                else:
+                    self.hits += 1
+                    return snapshot
+            self._discard(session_id)
+        self.misses += 1
+        return None
+
+    def set(self, session_id: str, metadata: Dict[str, Any], state: Optional[Dict[str, Any]] = None) -> None:
+        """Saves the metadata dump and extra state of a session, replacing any previous snapshot."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        self._store(session_id, dump_snapshot(metadata, state), expires_at)
+
+    def delete(self, session_id: str) -> None:
+        self._discard(session_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "invalid": self.invalid}
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU store bounded by the number of sessions."""
+
+    def __init__(self, max_entries: int = 10_000, ttl: Optional[float] = 3600.0):
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+
+    def _load(self, session_id: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self._entries.move_to_end(session_id)
+        return entry
+
+    def _store(self, session_id: str, data: bytes, expires_at: Optional[float]) -> None:
+        self._entries[session_id] = (data, expires_at)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _discard(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store kept in a local SQLite database, so sessions survive restarts and can
+    be shared by worker processes on the same host. Expired rows are purged
+    every `purge_interval` saves.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = 3600.0, purge_interval: int = 1000):
+        super().__init__(ttl)
+        self.path = path
+        self.purge_interval = purge_interval
+        self._saves = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS captivate_sessions (session_id TEXT PRIMARY KEY, expires_at REAL, data BLOB NOT NULL)"
+        )
+
+    def _load(self, session_id: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, expires_at FROM captivate_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return (bytes(row[0]), row[1]) if row is not None else None
+
+    def _store(self, session_id: str, data: bytes, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO captivate_sessions (session_id, expires_at, data) VALUES (?, ?, ?)",
+                (session_id, expires_at, data),
+            )
+            self._saves += 1
+            if self._saves % self.purge_interval == 0:
+                self.evictions += self._db.execute(
+                    "DELETE FROM captivate_sessions WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+                ).rowcount
+
+    def _discard(self, session_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM captivate_sessions WHERE session_id = ?", (session_id,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM captivate_sessions")
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_default_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """Returns the library-wide session store, or None when none is configured (the default)."""
+    return _default_store
+
+
+def set_session_store(store: Optional[SessionStore]) -> None:
+    """Sets (or, with None, removes) the library-wide session store."""
+    global _default_store
+    _default_store = store
@@ -0,0 +1,154 @@
+import asyncio
+import secrets
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
+
+from .client import CaptivateClient, _resolve_client
+from .instrumentation import span, STAGE_SEND
+from .serialization import dump_json_data
+
+if TYPE_CHECKING:
+    from .Captivate import Captivate
+
+DEFAULT_STREAM_MIN_CHARS = 80  # Buffered characters that trigger a send
+DEFAULT_STREAM_MAX_DELAY = 0.25  # Seconds a chunk may wait in the buffer before it is sent anyway
+
+
+class TextStream:
+    """
+    Sends a text reply in increments while it is being generated. Chunks are
+    buffered and sent as one text message once `min_chars` characters are
+    waiting, or `max_delay` seconds after the oldest unsent chunk, whichever
+    comes first. Each message carries only the new text and a `stream` marker
+    ({"id", "seq", "final"}); the channel appends the parts in `seq` order.
+    Leaving the context sends the rest with `final: true`, followed by any
+    messages set with set_response (e.g. buttons) and together with the
+    outgoing actions and the latest metadata. If the body raised, the last
+    part is marked `"aborted": true` instead and carries only the unsent text.
+
+    Created with Captivate.stream_text().
+    """
+
+    def __init__(
+        self,
+        captivate: "Captivate",
+        environment: str = "dev",
+        client: Optional[CaptivateClient] = None,
+        min_chars: int = DEFAULT_STREAM_MIN_CHARS,
+        max_delay: float = DEFAULT_STREAM_MAX_DELAY,
+    ):
+        self.captivate = captivate
+        self.url = captivate.PROD_URL_V2 if environment == "prod" else captivate.DEV_URL_V2
+        self.client = client
+        self.min_chars = min_chars
+        self.max_delay = max_delay
+        self.id = secrets.token_hex(8)
+        self.seq = 0  # Number of parts sent so far
+        self.parts: List[str] = []  # Text of every chunk written so far
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()  # Parts go out one at a time, in order
+        self._base: Optional[Dict[str, Any]] = None
+        self._error: Optional[Exception] = None  # Failure of a timer-triggered send, raised on the next call
+        self.closed = False
+
+    @property
+    def text(self) -> str:
+        """The full text written so far."""
+        return "".join(self.parts)
+
+    async def __aenter__(self) -> "TextStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.aclose()
+            return
+        try:
+            await self.abort()
+        except Exception:
+            pass  # The body's exception is the one to report
+
+    async def write(self, chunk: str) -> None:
+        """Adds a chunk of text, sending the buffer if it reached min_chars."""
+        if self.closed:
+            raise ValueError("Cannot write to a closed text stream.")
+        self._raise_pending_error()
+        if not chunk:
+            return
+        self.parts.append(chunk)
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.min_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            self._error = e
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def flush(self, final: bool = False, aborted: bool = False) -> None:
+        """Sends the buffered text now (nothing is sent for an empty buffer, except the final part)."""
+        async with self._lock:
+            if not self._buffer and not final:
+                return
+            if self._timer is not None and self._timer is not asyncio.current_task():
+                self._timer.cancel()
+                self._timer = None
+            text = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            await self._send(text, final, aborted)
+
+    async def _send(self, text: str, final: bool, aborted: bool = False) -> None:
+        marker = {"id": self.id, "seq": self.seq, "final": final}
+        if aborted:
+            marker["aborted"] = True
+        message = {"type": "text", "text": text, "stream": marker}
+        if final and not aborted:
+            # The rest of the reply goes with the last part: messages set with set_response, outgoing actions
+            payload = self.captivate._sync_response().model_dump()
+            payload["response"].insert(0, message)
+        else:
+            if self._base is None:  # Snapshot everything but the messages once; intermediate parts reuse it
+                self._base = self.captivate._sync_response().model_dump(exclude={"response", "outgoing_action"})
+            payload = dict(self._base, outgoing_action=None, response=[message])
+        body = dump_json_data(payload)
+        session_id = self.captivate.session_id
+        with span(STAGE_SEND, session_id, url=self.url, bytes=len(body), stream_seq=self.seq) as stage:
+            response = await _resolve_client(self.client).send_json(
+                self.url, body, idempotency_key=f"{session_id}:{self.id}:{self.seq}", channel=self.captivate.get_channel()
+            )
+            stage.set(status=response.status_code)
+            response.raise_for_status()
+        self.seq += 1
+
+    async def aclose(self) -> None:
+        """Sends the remaining text as the final part. Calling it more than once is a no-op."""
+        if self.closed:
+            return
+        self.closed = True
+        await self.flush(final=True)
+        self._raise_pending_error()
+
+    async def abort(self) -> None:
+        """
+        Ends the stream after a failure, e.g. when the LLM errored mid-answer: the unsent
+        text goes out as a last part marked `"aborted": true`, without the messages set
+        with set_response or the outgoing actions. Calling it on a closed stream is a no-op.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._error = None
+        await self.flush(final=True, aborted=True)
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Optional, Any, Iterable, List, Union
+
+import httpx
+
+
+class Fault:
+    """One scripted outcome of FaultInjectingTransport: a delay, then an error or a response."""
+
+    def __init__(self, status: int = 200, delay: float = 0.0, error: Optional[Exception] = None, json: Any = None):
+        self.status = status
+        self.delay = delay  # Seconds to wait before answering
+        self.error = error  # Raised instead of answering, e.g. httpx.ConnectError("refused")
+        self.json = json if json is not None else {"ok": status < 400}
+
+
+FaultSpec = Union[Fault, int, Exception]
+
+
+class FaultInjectingTransport(httpx.AsyncBaseTransport):
+    """
+    In-process transport answering requests from a script of faults, for testing
+    retries, hedging and circuit breaking without a network.
+
+    Example:
+        transport = FaultInjectingTransport([503, httpx.ConnectError("refused"), Fault(200, delay=0.2)])
+        client = CaptivateClient(transport=transport, retry=RetryPolicy(max_attempts=3))
+    """
+
+    def __init__(self, faults: Iterable[FaultSpec] = (), default: Optional[Fault] = None, max_body_bytes: Optional[int] = None):
+        """
+        Args:
+            faults: Outcomes for the next requests, in order. An int is a status code,
+                an exception is raised as-is.
+            default (Fault, optional): Outcome once the script is exhausted; 200 by default.
+            max_body_bytes (int, optional): Answer 413 to larger request bodies, like a size-limited endpoint.
+        """
+        self.faults: List[Fault] = [self._as_fault(fault) for fault in faults]
+        self.default = default if default is not None else Fault()
+        self.max_body_bytes = max_body_bytes
+        self.requests: List[httpx.Request] = []
+
+    @staticmethod
+    def _as_fault(fault: FaultSpec) -> Fault:
+        if isinstance(fault, Fault):
+            return fault
+        if isinstance(fault, Exception):
+            return Fault(error=fault)
+        return Fault(status=fault)
+
+    def add(self, *faults: FaultSpec) -> None:
+        """Appends outcomes to the script."""
+        self.faults.extend(self._as_fault(fault) for fault in faults)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.max_body_bytes is not None and len(await request.aread()) > self.max_body_bytes:
+            return httpx.Response(413, json={"ok": False, "error": "Payload too large"}, request=request)
+        fault = self.faults.pop(0) if self.faults else self.default
+        if fault.delay:
+            await asyncio.sleep(fault.delay)
+        if fault.error is not None:
+            raise fault.error
+        return httpx.Response(fault.status, json=fault.json, request=request)
@@ -0,0 +1,54 @@
+import copy
+import json
+from typing import Any, Callable, Dict, List
+
+import httpx
+import pytest
+
+from src.captivate_ai_api import Captivate
+
+PAYLOAD = {
+    "session_id": "test-session",
+    "user_input": "hello",
+    "files": None,
+    "incoming_action": [{"id": "sendEmail", "payload": {"email": "user@example.com"}}],
+    "metadata": {
+        "internal": {
+            "channelMetadata": {
+                "channelMetadata": {"channel": "custom-channel", "channelData": {}},
+                "user": {"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com"},
+                "custom": {"mode": "test", "keep": 1, "drop": 2},
+                "private": {"token": "secret"},
+            }
+        }
+    },
+    "hasLivechat": False,
+}
+
+
+class RecordingTransport(httpx.MockTransport):
+    """MockTransport that keeps every request and answers with `respond` (200 by default)."""
+
+    def __init__(self, respond: Callable[[httpx.Request], httpx.Response] = None):
+        self.requests: List[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            if respond is not None:
+                return respond(request)
+            return httpx.Response(200, json={"ok": True})
+
+        super().__init__(handler)
+
+    def bodies(self) -> List[Dict[str, Any]]:
+        return [json.loads(request.content) for request in self.requests]
+
+
+@pytest.fixture
+def payload() -> Dict[str, Any]:
+    return copy.deepcopy(PAYLOAD)
+
+
+@pytest.fixture
+def captivate(payload) -> Captivate:
+    return Captivate.create(payload)
@@ -0,0 +1,32 @@
+from src.captivate_ai_api.cache import attachment_cache_key
+
+
+def key(url):
+    return attachment_cache_key({"url": url})
+
+
+def test_file_key_is_preferred():
+    assert attachment_cache_key({"url": "https://host/a?id=1", "storage": {"fileKey": "uploads/a.pdf"}}) == "uploads/a.pdf"
+
+
+def test_files_behind_one_endpoint_do_not_collide():
+    assert key("https://host/download?id=1") != key("https://host/download?id=2")
+    assert key("https://host/download?id=1") == key("https://host/download?id=1")
+
+
+def test_presigned_signature_is_ignored():
+    first = "https://bucket.s3.amazonaws.com/a.pdf?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Date=20240101T000000Z&X-Amz-Signature=abc"
+    second = "https://bucket.s3.amazonaws.com/a.pdf?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Date=20240101T010000Z&X-Amz-Signature=def"
+    assert key(first) == key(second) == key("https://bucket.s3.amazonaws.com/a.pdf")
+
+    assert key("https://cdn.test/a.pdf?Expires=1&Signature=x&Key-Pair-Id=k") == key("https://cdn.test/a.pdf?Expires=2&Signature=y&Key-Pair-Id=k")
+    assert key("https://acct.blob.core.windows.net/c/a.pdf?sv=2022&se=2024&sp=r&sig=x") == key("https://acct.blob.core.windows.net/c/a.pdf?sv=2022&se=2025&sp=r&sig=y")
+
+
+def test_other_parameters_of_a_signed_url_are_kept():
+    assert key("https://host/a?version=1&X-Amz-Signature=x") != key("https://host/a?version=2&X-Amz-Signature=x")
+    assert key("https://host/a?st=1") != key("https://host/a?st=2")  # No SAS signature: st is the app's own
+
+
+def test_no_url_means_no_key():
+    assert attachment_cache_key({"storage": {}}) is None
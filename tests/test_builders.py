@@ -0,0 +1,25 @@
+import pytest
+
+from src.captivate_ai_api import Card, ResponseBuilder
+
+CARD = {"text": "t", "description": "d", "image_url": "i", "link": "l"}
+
+
+def test_card_shapes_build_the_same():
+    builder = ResponseBuilder().cards([Card("t", "d", "i", "l"), ("t", "d", "i", "l"), ["t", "d", "i", "l"], dict(CARD)])
+
+    assert builder.build() == [{"type": "cards", "cards": [CARD] * 4}]
+
+
+@pytest.mark.parametrize("card", ["abcd", b"abcd", 42, None, {"t", "d", "i", "l"}], ids=repr)
+def test_other_card_types_are_rejected(card):
+    with pytest.raises(ValueError, match=r"message 0, card 1: expected a Card, a 4-tuple or a dict"):
+        ResponseBuilder().cards([CARD, card]).build()
+
+
+def test_wrong_field_count_and_types_are_reported():
+    with pytest.raises(ValueError) as error:
+        ResponseBuilder().text("ok").cards([("t", "d", "i"), ("t", "d", "i", 3)]).build()
+
+    assert "message 1, card 0: expected 4 fields, got 3" in str(error.value)
+    assert "message 1, card 1: 'link' must be a string" in str(error.value)
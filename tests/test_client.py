@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from src.captivate_ai_api import CaptivateClient, TextMessageModel, set_default_client
+
+from .conftest import RecordingTransport
+
+
+@pytest.fixture
+def default_client():
+    transport = RecordingTransport()
+    set_default_client(CaptivateClient(transport=transport))
+    yield transport
+    set_default_client(None)
+
+
+def test_shared_client_survives_successive_event_loops(captivate, default_client):
+    captivate.set_response([TextMessageModel(text="first")])
+    assert asyncio.run(captivate.async_send_message()) == {"ok": True}
+
+    captivate.set_response([TextMessageModel(text="second")])
+    assert asyncio.run(captivate.async_send_message()) == {"ok": True}
+
+    assert [body["response"][0]["text"] for body in default_client.bodies()] == ["first", "second"]
+
+
+def test_each_loop_gets_its_own_pool():
+    client = CaptivateClient(transport=RecordingTransport())
+
+    async def pool():
+        return client.http
+
+    first = asyncio.run(pool())
+    second = asyncio.run(pool())
+
+    assert first is not second
+    assert len(client._clients) <= 1  # The pool of the closed loop was dropped
+
+
+def test_aclose_closes_the_pool_of_the_running_loop():
+    client = CaptivateClient(transport=RecordingTransport())
+
+    async def scenario():
+        async with client:
+            pool = client.http
+            assert client.is_started
+            assert client.http is pool
+        return pool
+
+    assert asyncio.run(scenario()).is_closed
+    assert not client.is_started
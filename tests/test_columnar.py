@@ -0,0 +1,36 @@
+import pytest
+
+from src.captivate_ai_api.columnar import render_table
+
+
+def test_records_and_columns_render_the_same():
+    rows = [("Ada", 36), ("Alan", None), ("<b>", 1)]
+    by_columns = render_table(columns={"Name": ["Ada", "Alan", "<b>"], "Age": [36, None, 1]})
+
+    assert render_table(records=rows, headers=["Name", "Age"]) == by_columns
+    assert render_table(records=[{"Name": n, "Age": a} for n, a in rows]) == by_columns
+    assert "<td>&lt;b&gt;</td>" in by_columns
+
+
+def test_ragged_rows_are_rejected():
+    with pytest.raises(ValueError, match="rows must have the same length"):
+        render_table(records=[(1, 2, 3), (4, 5)])
+
+    with pytest.raises(ValueError, match="rows must have the same length"):
+        render_table(records=[(1, 2, 3), (4, 5)], headers=["a", "b", "c"])
+
+
+def test_header_count_must_match_rows():
+    with pytest.raises(ValueError, match="Got 2 headers for rows of 3 values"):
+        render_table(records=[(1, 2, 3)], headers=["a", "b"])
+
+
+@pytest.mark.parametrize("max_rows", [0, 2, 5, 10])
+def test_max_rows_truncates(max_rows):
+    rows = [(i, f"row {i}") for i in range(5)]
+
+    html = render_table(records=rows, headers=["n", "text"], max_rows=max_rows)
+
+    assert html.count("<tr><td>") == min(max_rows, 5)
+    assert ("more rows not shown" in html) == (max_rows < 5)
+    assert html == render_table(columns={"n": [r[0] for r in rows], "text": [r[1] for r in rows]}, max_rows=max_rows)
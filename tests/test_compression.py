@@ -0,0 +1,64 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from src.captivate_ai_api import CaptivateClient, HtmlMessageModel, TextMessageModel
+
+from .conftest import RecordingTransport
+
+
+def send(captivate, client):
+    async def scenario():
+        await captivate.async_send_message(client=client)
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_gzip_round_trip(captivate):
+    transport = RecordingTransport()
+    client = CaptivateClient(transport=transport, compression="gzip", compression_threshold=1024)
+    captivate.set_response([HtmlMessageModel(html="<tr><td>row</td></tr>" * 500)])
+
+    send(captivate, client)
+
+    request = transport.requests[0]
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert request.headers["Content-Type"] == "application/json"
+    assert gzip.decompress(request.content) == captivate.get_response_json()
+    assert client.compression_stats.requests == 1
+    assert client.compression_stats.ratio < 0.2
+
+
+def test_small_bodies_are_not_compressed(captivate):
+    transport = RecordingTransport()
+    client = CaptivateClient(transport=transport, compression="gzip", compression_threshold=64 * 1024)
+    captivate.set_response([TextMessageModel(text="short")])
+
+    send(captivate, client)
+
+    request = transport.requests[0]
+    assert "Content-Encoding" not in request.headers
+    assert json.loads(request.content) == json.loads(captivate.get_response_json())
+    assert client.compression_stats.skipped == 1
+    assert client.compression_stats.requests == 0
+
+
+def test_zstd_round_trip(captivate):
+    zstandard = pytest.importorskip("zstandard")
+    transport = RecordingTransport()
+    client = CaptivateClient(transport=transport, compression="zstd", compression_threshold=1024)
+    captivate.set_response([HtmlMessageModel(html="<p>paragraph</p>" * 500)])
+
+    send(captivate, client)
+
+    request = transport.requests[0]
+    assert request.headers["Content-Encoding"] == "zstd"
+    assert zstandard.ZstdDecompressor().decompress(request.content) == captivate.get_response_json()
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        CaptivateClient(compression="brotli")
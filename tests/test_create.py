@@ -0,0 +1,33 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.captivate_ai_api import Captivate, ChatRequest
+
+
+def test_from_json_matches_create(payload):
+    from_json = Captivate.from_json(json.dumps(payload).encode())
+    created = Captivate.create(ChatRequest(**payload))
+
+    assert from_json.model_dump() == created.model_dump()
+    assert from_json.get_response_json() == created.get_response_json()
+
+
+def test_from_json_reads_only_request_fields(payload):
+    payload["response"] = {"session_id": "forged", "metadata": payload["metadata"], "hasLivechat": True}
+    payload["DEV_URL_V2"] = "https://attacker.example/collect"
+
+    captivate = Captivate.from_json(json.dumps(payload))
+
+    assert captivate.response is None
+    assert captivate.DEV_URL_V2 == Captivate.DEV_URL_V2 != payload["DEV_URL_V2"]
+
+
+def test_from_json_rejects_bad_bodies(payload):
+    with pytest.raises(json.JSONDecodeError):
+        Captivate.from_json(b"{not json")
+
+    del payload["session_id"]
+    with pytest.raises(ValidationError):
+        Captivate.from_json(json.dumps(payload).encode())
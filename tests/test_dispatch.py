@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from src.captivate_ai_api import ActionDispatcher, ActionModel
+
+
+def actions(*ids):
+    return [ActionModel(id=action_id) for action_id in ids]
+
+
+def test_dependencies_run_first_and_failures_skip_dependents():
+    dispatcher = ActionDispatcher()
+    order = []
+
+    @dispatcher.on("fetch")
+    async def fetch(action, captivate):
+        await asyncio.sleep(0.01)
+        order.append("fetch")
+        return "order"
+
+    @dispatcher.on("email", after=["fetch"])
+    async def email(action, captivate):
+        order.append("email")
+
+    @dispatcher.on("broken")
+    async def broken(action, captivate):
+        raise RuntimeError("boom")
+
+    @dispatcher.on("notify", after=["broken"])
+    async def notify(action, captivate):
+        order.append("notify")
+
+    result = asyncio.run(dispatcher.dispatch(actions("email", "fetch", "broken", "notify", "unknown")))
+
+    assert order == ["fetch", "email"]
+    assert [r.ok for r in result.results] == [True, True, False, False, True]
+    assert result.results[1].result == "order"
+    assert result.results[3].error == "Skipped: dependency 'broken' failed."
+    assert not result.results[4].handled
+
+
+def test_timeout_cancels_slow_handlers():
+    dispatcher = ActionDispatcher()
+
+    @dispatcher.on("slow")
+    async def slow(action, captivate):
+        await asyncio.sleep(1)
+
+    result = asyncio.run(dispatcher.dispatch(actions("slow"), timeout=0.01))
+
+    assert result.results[0].error.startswith("TimeoutError")
+
+
+def test_cancelled_dispatch_cancels_its_handlers():
+    dispatcher = ActionDispatcher()
+    finished = []
+
+    @dispatcher.on("slow")
+    async def slow(action, captivate):
+        await asyncio.sleep(0.1)
+        finished.append(action.id)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(dispatcher.dispatch(actions("slow", "slow")), 0.01)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+
+    assert finished == []
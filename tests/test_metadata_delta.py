@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import httpx
+
+from src.captivate_ai_api import CaptivateClient, TextMessageModel, apply_metadata_delta
+
+from .conftest import RecordingTransport
+
+
+def full_metadata(captivate):
+    return json.loads(captivate.get_response_json())["metadata"]
+
+
+def test_changes_are_tracked(captivate):
+    assert not captivate.has_metadata_changes()
+
+    captivate.set_metadata("new", {"a": 1})
+    captivate.remove_metadata("drop")
+    captivate.set_private_metadata("token", "rotated")
+
+    assert captivate.has_metadata_changes()
+    assert captivate.get_metadata_changes() == {
+        "custom": {"set": {"new": {"a": 1}}, "removed": ["drop"]},
+        "private": {"set": {"token": "rotated"}, "removed": []},
+    }
+
+
+def test_set_after_remove_counts_as_set(captivate):
+    captivate.remove_metadata("drop")
+    captivate.set_metadata("drop", 3)
+
+    assert captivate.get_metadata_changes()["custom"] == {"set": {"drop": 3}, "removed": []}
+
+
+def test_delta_body_carries_only_changes(captivate):
+    captivate.set_metadata("new", "value")
+
+    body = json.loads(captivate.get_response_json(metadata_delta=True))
+    channel_metadata = body["metadata"]["internal"]["channelMetadata"]
+
+    assert body["metadataMode"] == "delta"
+    assert channel_metadata["custom"] == {"new": "value"}
+    assert channel_metadata["private"] == {}
+    assert channel_metadata["removed"] == {"custom": [], "private": []}
+
+
+def test_apply_metadata_delta_matches_full_send(captivate):
+    before = full_metadata(captivate)
+    captivate.set_metadata("new", [1, 2, 3])
+    captivate.set_metadata("keep", "changed")
+    captivate.remove_metadata("drop")
+    captivate.set_private_metadata("extra", True)
+
+    delta = json.loads(captivate.get_response_json(metadata_delta=True))["metadata"]
+
+    assert apply_metadata_delta(before, delta) == full_metadata(captivate)
+
+
+def test_apply_metadata_delta_leaves_inputs_untouched(captivate):
+    before = full_metadata(captivate)
+    snapshot = json.loads(json.dumps(before))
+    captivate.remove_metadata("keep")
+    delta = json.loads(captivate.get_response_json(metadata_delta=True))["metadata"]
+
+    apply_metadata_delta(before, delta)
+
+    assert before == snapshot
+
+
+def test_stub_server_merges_delta_sends(captivate):
+    # Stub channel keeping the metadata per session, merging delta sends like the real receiver
+    stored = {}
+
+    def respond(request):
+        body = json.loads(request.content)
+        if body.get("metadataMode") == "delta":
+            stored[body["session_id"]] = apply_metadata_delta(stored[body["session_id"]], body["metadata"])
+        else:
+            stored[body["session_id"]] = body["metadata"]
+        return httpx.Response(200, json={"ok": True})
+
+    transport = RecordingTransport(respond)
+    client = CaptivateClient(transport=transport)
+
+    async def scenario():
+        captivate.set_response([TextMessageModel(text="first")])
+        await captivate.async_send_message(client=client)
+        captivate.set_metadata("step", 2)
+        captivate.remove_metadata("drop")
+        captivate.set_response([TextMessageModel(text="second")])
+        await captivate.async_send_message(client=client, metadata_delta=True)
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+    first, second = transport.bodies()
+    assert "metadataMode" not in first
+    assert second["metadataMode"] == "delta"
+    assert "token" not in second["metadata"]["internal"]["channelMetadata"]["private"]
+    assert stored[captivate.session_id] == full_metadata(captivate)
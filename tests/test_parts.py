@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.captivate_ai_api import (
+    ActionModel,
+    CaptivateClient,
+    HtmlMessageModel,
+    ResponseTooLargeError,
+    TextMessageModel,
+    set_json_encoder,
+)
+from src.captivate_ai_api.testing import FaultInjectingTransport
+
+LIMIT = 4096
+
+
+def send(captivate, transport, **send_kwargs):
+    async def scenario():
+        async with CaptivateClient(transport=transport) as client:
+            return await captivate.async_send_message(client=client, **send_kwargs)
+
+    return asyncio.run(scenario())
+
+
+def bodies(transport):
+    return [json.loads(request.content) for request in transport.requests]
+
+
+@pytest.fixture
+def long_response(captivate):
+    captivate.set_response([TextMessageModel(text=f"Message {i}: " + "lorem ipsum " * 40) for i in range(30)])
+    captivate.set_outgoing_action([ActionModel(id="done", payload={"step": 2})])
+    return captivate
+
+
+@pytest.fixture
+def json_dumps_encoder():
+    set_json_encoder(lambda data: json.dumps(data, separators=(",", ":")).encode())
+    yield
+    set_json_encoder(None)
+
+
+def test_oversized_response_is_rejected_without_max_bytes(long_response):
+    transport = FaultInjectingTransport(max_body_bytes=LIMIT)
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        send(long_response, transport)
+
+    assert error.value.response.status_code == 413
+
+
+def test_response_is_split_into_ordered_parts(long_response):
+    transport = FaultInjectingTransport(max_body_bytes=LIMIT)
+    expected = json.loads(long_response.get_response_json())
+
+    assert send(long_response, transport, max_bytes=LIMIT) == {"ok": True}
+
+    parts = bodies(transport)
+    assert len(parts) > 1
+    assert all(len(request.content) <= LIMIT for request in transport.requests)
+    assert [part["part"] for part in parts] == [{"index": i, "total": len(parts)} for i in range(len(parts))]
+    assert [message for part in parts for message in part["response"]] == expected["response"]
+    assert [part["outgoing_action"] for part in parts] == [None] * (len(parts) - 1) + [expected["outgoing_action"]]
+    for part in parts:
+        assert part["session_id"] == expected["session_id"]
+        assert part["metadata"] == expected["metadata"]
+
+
+def test_parts_get_their_own_idempotency_keys(long_response):
+    transport = FaultInjectingTransport(max_body_bytes=LIMIT)
+
+    send(long_response, transport, max_bytes=LIMIT)
+
+    keys = [request.headers["Idempotency-Key"] for request in transport.requests]
+    assert [key.rsplit(":", 1)[1] for key in keys] == [f"part{i}" for i in range(len(keys))]
+    assert len(set(keys)) == len(keys)
+
+
+def test_client_default_limit_is_used(long_response):
+    transport = FaultInjectingTransport(max_body_bytes=LIMIT)
+
+    async def scenario():
+        async with CaptivateClient(transport=transport, max_body_bytes=LIMIT) as client:
+            await long_response.async_send_message(client=client)
+
+    asyncio.run(scenario())
+
+    assert len(transport.requests) > 1
+
+
+def test_response_that_fits_is_one_plain_body(long_response):
+    assert long_response.get_response_parts(1024 * 1024) == [long_response.get_response_json()]
+
+
+def test_delta_parts_carry_the_delta_marker(long_response):
+    long_response.set_metadata("step", 2)
+
+    parts = [json.loads(body) for body in long_response.get_response_parts(LIMIT, metadata_delta=True)]
+    expected = json.loads(long_response.get_response_json(metadata_delta=True))
+
+    assert len(parts) > 1
+    assert all(part["metadataMode"] == "delta" and part["metadata"] == expected["metadata"] for part in parts)
+
+
+def test_parts_with_custom_encoder(long_response, json_dumps_encoder):
+    single = long_response.get_response_parts(1024 * 1024)
+    assert json.loads(single[0]) == json.loads(long_response.get_response_json())
+
+    parts = [json.loads(body) for body in long_response.get_response_parts(LIMIT)]
+    assert len(parts) > 1
+    assert [message for part in parts for message in part["response"]] == json.loads(long_response.get_response_json())["response"]
+
+
+def test_single_message_too_large_for_a_part(captivate):
+    captivate.set_response([TextMessageModel(text="short"), HtmlMessageModel(html="<p>x</p>" * 1000)])
+
+    with pytest.raises(ResponseTooLargeError) as error:
+        captivate.get_response_parts(LIMIT)
+
+    assert error.value.index == 1
+    assert error.value.size > LIMIT
+
+
+def test_envelope_too_large_for_a_part(captivate):
+    captivate.set_metadata("blob", "x" * LIMIT)
+    captivate.set_response([TextMessageModel(text="a"), TextMessageModel(text="b")])
+
+    with pytest.raises(ResponseTooLargeError) as error:
+        captivate.get_response_parts(LIMIT)
+
+    assert error.value.index is None
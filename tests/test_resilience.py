@@ -0,0 +1,198 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.captivate_ai_api import CaptivateClient, CircuitBreaker, CircuitOpenError, HedgePolicy, RetryPolicy
+from src.captivate_ai_api.resilience import send_with_resilience
+from src.captivate_ai_api.testing import Fault, FaultInjectingTransport
+
+URL = "http://channel.test/api/channel/v2/sendMessage"
+NO_BACKOFF = dict(backoff_base=0.0, jitter=False)
+
+
+def post(transport, **client_kwargs):
+    """Sends one JSON body through a fresh client; returns the response or raises its error."""
+    async def scenario():
+        async with CaptivateClient(transport=transport, **client_kwargs) as client:
+            return await client.send_json(URL, b"{}")
+
+    return asyncio.run(scenario())
+
+
+def test_retries_until_success():
+    transport = FaultInjectingTransport([503, httpx.ConnectError("refused"), 200])
+
+    response = post(transport, retry=RetryPolicy(max_attempts=3, **NO_BACKOFF))
+
+    assert response.status_code == 200
+    assert len(transport.requests) == 3
+
+
+def test_returns_last_response_when_retries_are_exhausted():
+    transport = FaultInjectingTransport([503, 502])
+
+    response = post(transport, retry=RetryPolicy(max_attempts=2, **NO_BACKOFF))
+
+    assert response.status_code == 502
+    assert len(transport.requests) == 2
+
+
+def test_raises_last_transport_error_when_retries_are_exhausted():
+    transport = FaultInjectingTransport([httpx.ConnectError("one"), httpx.ConnectError("two")])
+
+    with pytest.raises(httpx.ConnectError, match="two"):
+        post(transport, retry=RetryPolicy(max_attempts=2, **NO_BACKOFF))
+
+
+def test_client_errors_are_not_retried():
+    transport = FaultInjectingTransport([400])
+
+    response = post(transport, retry=RetryPolicy(max_attempts=3, **NO_BACKOFF))
+
+    assert response.status_code == 400
+    assert len(transport.requests) == 1
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3, jitter=False)
+    assert [policy.backoff(retry) for retry in range(4)] == [0.1, 0.2, 0.3, 0.3]
+
+    jittered = RetryPolicy(backoff_base=0.1, backoff_max=0.3)
+    assert all(0 <= jittered.backoff(2) <= 0.3 for _ in range(100))
+
+
+def test_hedge_fires_after_delay_and_wins():
+    transport = FaultInjectingTransport([Fault(200, delay=0.5, json={"from": "slow"}), Fault(200, json={"from": "hedge"})])
+    hedge = HedgePolicy(default_delay=0.05)
+
+    response = post(transport, hedge=hedge)
+
+    assert response.json() == {"from": "hedge"}
+    assert len(transport.requests) == 2
+    assert hedge.hedges_fired == 1
+    assert hedge.hedges_won == 1
+
+
+def test_hedge_not_fired_for_fast_responses():
+    transport = FaultInjectingTransport([200])
+    hedge = HedgePolicy(default_delay=0.5)
+
+    post(transport, hedge=hedge)
+
+    assert len(transport.requests) == 1
+    assert hedge.hedges_fired == 0
+
+
+def test_hedge_delay_follows_the_latency_percentile():
+    hedge = HedgePolicy(percentile=50, min_samples=3, default_delay=1.0, min_delay=0.0)
+    assert hedge.delay(URL) == 1.0
+
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        hedge.record(URL, latency)
+
+    assert hedge.delay(URL) == 0.3
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    transport = FaultInjectingTransport([500, 500])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    assert post(transport, circuit_breaker=breaker).status_code == 500
+    assert breaker.state(URL) == CircuitBreaker.CLOSED
+    assert post(transport, circuit_breaker=breaker).status_code == 500
+    assert breaker.state(URL) == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        post(transport, circuit_breaker=breaker)
+    assert len(transport.requests) == 2  # Nothing sent while open
+
+
+def test_breaker_half_open_trial_closes_or_reopens():
+    transport = FaultInjectingTransport([500, 500, 200])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+
+    post(transport, circuit_breaker=breaker)
+    assert breaker.state(URL) == CircuitBreaker.OPEN
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.state(URL) == CircuitBreaker.HALF_OPEN
+    post(transport, circuit_breaker=breaker)  # Failed trial
+    assert breaker.state(URL) == CircuitBreaker.OPEN
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert post(transport, circuit_breaker=breaker).status_code == 200  # Successful trial
+    assert breaker.state(URL) == CircuitBreaker.CLOSED
+
+
+def test_breaker_allows_one_trial_at_a_time():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure(URL)
+
+    breaker.check(URL)  # The trial
+    with pytest.raises(CircuitOpenError):
+        breaker.check(URL)
+
+
+def test_cancelled_trial_does_not_wedge_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    transport = FaultInjectingTransport([500, Fault(200, delay=1.0), 200])
+
+    async def scenario():
+        async with CaptivateClient(transport=transport, circuit_breaker=breaker) as client:
+            await client.send_json(URL, b"{}")
+            await asyncio.sleep(0.06)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.send_json(URL, b"{}"), 0.05)  # Trial cancelled
+            assert breaker.state(URL) == CircuitBreaker.HALF_OPEN
+            return await client.send_json(URL, b"{}")  # A new trial
+
+    assert asyncio.run(scenario()).status_code == 200
+    assert breaker.state(URL) == CircuitBreaker.CLOSED
+
+
+def test_unexpected_error_releases_the_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure(URL)
+
+    async def broken():
+        raise RuntimeError("bug in send")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(send_with_resilience(broken, URL, retry=RetryPolicy(**NO_BACKOFF), breaker=breaker))
+
+    breaker.check(URL)  # A new trial is allowed
+
+
+def test_caller_timeouts_do_not_open_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    transport = FaultInjectingTransport(default=Fault(200, delay=0.2))
+
+    async def scenario():
+        async with CaptivateClient(transport=transport, circuit_breaker=breaker) as client:
+            for _ in range(3):
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(client.send_json(URL, b"{}"), 0.01)
+
+    asyncio.run(scenario())
+
+    assert breaker.state(URL) == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("hedge_delay", [1.0, 0.01], ids=["before_hedge", "after_hedge"])
+def test_cancelled_hedged_send_leaves_no_request_running(hedge_delay):
+    completed = []
+
+    async def send():
+        await asyncio.sleep(0.1)
+        completed.append(True)
+        return httpx.Response(200)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(send_with_resilience(send, URL, hedge=HedgePolicy(default_delay=hedge_delay)), 0.05)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(scenario())
+
+    assert completed == []
@@ -0,0 +1,36 @@
+import pytest
+
+from src.captivate_ai_api import CaptivateResponseModel, TextMessageModel
+
+MALFORMED = [
+    {"type": "text", "text": None},
+    {"type": "button", "buttons": [{"title": "Yes"}]},
+    {"type": "files", "files": [{"type": "application/pdf"}]},
+    {"type": "cards", "cards": [{"text": "t"}]},
+    {"type": "cards", "text": "flat card"},
+]
+
+
+def validate(messages, payload):
+    return CaptivateResponseModel.model_validate(
+        {"response": messages, "session_id": payload["session_id"], "metadata": payload["metadata"], "hasLivechat": False}
+    ).response
+
+
+@pytest.mark.parametrize("message", MALFORMED, ids=lambda message: message["type"])
+def test_malformed_typed_dict_is_kept_as_dict(message, payload):
+    assert validate([message], payload) == [message]
+
+
+@pytest.mark.parametrize("message", MALFORMED, ids=lambda message: message["type"])
+def test_set_response_accepts_malformed_typed_dict(message, captivate):
+    captivate.set_response([message])
+
+    assert captivate.get_response()["response"] == [message]
+
+
+def test_well_formed_dicts_become_models(payload):
+    text, custom = validate([{"type": "text", "text": "hi"}, {"type": "policy_assesment_id", "id": 7}], payload)
+
+    assert isinstance(text, TextMessageModel)
+    assert custom == {"type": "policy_assesment_id", "id": 7}
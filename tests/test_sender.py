@@ -0,0 +1,58 @@
+import asyncio
+import hashlib
+
+from src.captivate_ai_api import BackgroundSender, CaptivateClient, TextMessageModel
+from src.captivate_ai_api import sender as sender_module
+
+from .conftest import RecordingTransport
+
+
+def run(scenario, transport, **sender_kwargs):
+    async def main():
+        async with CaptivateClient(transport=transport) as client:
+            async with BackgroundSender(client=client, **sender_kwargs) as sender:
+                futures = await scenario(sender)
+            return [future.result() for future in futures]
+
+    return asyncio.run(main())
+
+
+def test_single_reply_is_encoded_once(captivate, monkeypatch):
+    encoded = []
+
+    def counting_dump(data):
+        encoded.append(data)
+        return real_dump(data)
+
+    real_dump = sender_module.dump_json_data
+    monkeypatch.setattr(sender_module, "dump_json_data", counting_dump)
+    transport = RecordingTransport()
+    captivate.set_response([TextMessageModel(text="hello")])
+
+    async def scenario(sender):
+        return [await captivate.enqueue_message(sender=sender)]
+
+    assert run(scenario, transport, coalesce_window=0) == [{"ok": True}]
+
+    request, = transport.requests
+    assert encoded == []  # The body encoded by enqueue_message is sent as-is
+    digest = request.headers["Idempotency-Key"].rsplit(":", 1)[1]
+    assert digest == hashlib.blake2b(request.content, digest_size=8).hexdigest()
+    assert transport.bodies()[0]["response"] == [{"type": "text", "text": "hello"}]
+
+
+def test_replies_within_the_window_are_merged(captivate):
+    transport = RecordingTransport()
+
+    async def scenario(sender):
+        futures = []
+        for text in ("one", "two", "three"):
+            captivate.set_response([TextMessageModel(text=text)])
+            futures.append(await captivate.enqueue_message(sender=sender))
+        return futures
+
+    assert run(scenario, transport, coalesce_window=0.05) == [{"ok": True}] * 3
+
+    body, = transport.bodies()
+    assert [message["text"] for message in body["response"]] == ["one", "two", "three"]
+    assert len(transport.requests[0].headers["Idempotency-Key"].split(",")) == 3
@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.captivate_ai_api import ActionModel, ButtonMessageModel, CaptivateClient
+
+from .conftest import RecordingTransport
+
+
+def stream_parts(transport):
+    """(text, stream marker) of the streamed message of every recorded request."""
+    return [(body["response"][0]["text"], body["response"][0]["stream"]) for body in transport.bodies()]
+
+
+def run_stream(captivate, chunks, transport=None, delay=0.0, **stream_kwargs):
+    transport = transport or RecordingTransport()
+
+    async def scenario():
+        async with CaptivateClient(transport=transport) as client:
+            async with captivate.stream_text(client=client, **stream_kwargs) as stream:
+                for chunk in chunks:
+                    await stream.write(chunk)
+                    if delay:
+                        await asyncio.sleep(delay)
+            return stream
+
+    return asyncio.run(scenario()), transport
+
+
+def test_parts_are_sent_in_order_and_end_final(captivate):
+    stream, transport = run_stream(captivate, ["Hello ", "world, ", "this is ", "streamed."], min_chars=10, max_delay=5)
+
+    parts = stream_parts(transport)
+    assert "".join(text for text, _ in parts) == "Hello world, this is streamed."
+    assert [marker["seq"] for _, marker in parts] == list(range(len(parts)))
+    assert [marker["final"] for _, marker in parts] == [False] * (len(parts) - 1) + [True]
+    assert len({marker["id"] for _, marker in parts}) == 1
+    assert stream.text == "Hello world, this is streamed."
+
+
+def test_buffer_is_sent_once_min_chars_are_waiting(captivate):
+    _, transport = run_stream(captivate, ["ab", "cd", "ef", "gh"], min_chars=4, max_delay=5)
+
+    assert [text for text, _ in stream_parts(transport)] == ["abcd", "efgh", ""]
+
+
+def test_buffer_is_sent_after_max_delay(captivate):
+    _, transport = run_stream(captivate, ["a", "b"], delay=0.05, min_chars=1000, max_delay=0.01)
+
+    assert [text for text, _ in stream_parts(transport)] == ["a", "b", ""]
+
+
+def test_parts_have_distinct_idempotency_keys(captivate):
+    _, transport = run_stream(captivate, ["one", "two"], min_chars=3)
+
+    keys = [request.headers["Idempotency-Key"] for request in transport.requests]
+    assert len(keys) == len(set(keys)) == 3
+
+
+def test_final_part_carries_messages_and_actions(captivate):
+    captivate.set_response([ButtonMessageModel(buttons={"title": "More?", "options": []})])
+    captivate.set_outgoing_action([ActionModel(id="done")])
+
+    _, transport = run_stream(captivate, ["answer"], min_chars=1000, max_delay=5)
+
+    *intermediate, final = transport.bodies()
+    assert [message["type"] for message in final["response"]] == ["text", "button"]
+    assert final["response"][0]["stream"]["final"] is True
+    assert final["outgoing_action"][0]["id"] == "done"
+    assert all(body["outgoing_action"] is None for body in intermediate)
+
+
+def test_failure_in_body_sends_aborted_part(captivate):
+    captivate.set_outgoing_action([ActionModel(id="done")])
+    transport = RecordingTransport()
+
+    async def scenario():
+        async with CaptivateClient(transport=transport) as client:
+            async with captivate.stream_text(client=client, min_chars=4, max_delay=5) as stream:
+                await stream.write("partial")
+                await stream.write("..")
+                raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError, match="generation failed"):
+        asyncio.run(scenario())
+
+    parts = stream_parts(transport)
+    assert [text for text, _ in parts] == ["partial", ".."]
+    assert parts[-1][1] == {"id": parts[0][1]["id"], "seq": 1, "final": True, "aborted": True}
+    assert transport.bodies()[-1]["outgoing_action"] is None
+
+
+def test_send_error_is_raised(captivate):
+    transport = RecordingTransport(lambda request: httpx.Response(503))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_stream(captivate, ["some text"], transport=transport, min_chars=1)
+
+
+def test_write_after_close_is_rejected(captivate):
+    stream, _ = run_stream(captivate, ["done"])
+
+    with pytest.raises(ValueError):
+        asyncio.run(stream.write("more"))